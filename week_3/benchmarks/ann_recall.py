@@ -0,0 +1,103 @@
+"""
+Recall vs latency of the HNSW backend against exact flat search.
+
+Run from the week_3 directory:
+
+    python -m benchmarks.ann_recall --size 100000 --dimension 384
+"""
+import argparse
+import json
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.common import clustered_vectors, percentile_ms, search_ids
+from core.hnsw_store import HNSWVectorStore
+from core.numpy_store import NumpyVectorStore
+
+def run(
+    size: int,
+    dimension: int,
+    queries: int,
+    k: int,
+    M: int,
+    ef_construction: int,
+    ef_search_values: List[int],
+    batch_size: int=10_000,
+    seed: int=0
+) -> Dict:
+    """Build both indexes over the same vectors and compare them at each ef_search"""
+    rng = np.random.default_rng(seed)
+    vectors = clustered_vectors(rng, size, dimension)
+    query_vectors = clustered_vectors(rng, queries, dimension)
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        hnsw = HNSWVectorStore("bench", None, directory, M=M, ef_construction=ef_construction)
+        for offset in range(0, size, batch_size):
+            batch = vectors[offset:offset + batch_size]
+            hnsw.add_embeddings(
+                texts=[""] * len(batch),
+                embeddings=batch,
+                ids=[str(row) for row in range(offset, offset + len(batch))]
+            )
+        hnsw.persist()
+        build_seconds = time.perf_counter() - start
+
+        # The flat store reads the very same matrix
+        flat = NumpyVectorStore("bench", None, directory)
+        exact, exact_latencies = search_ids(flat, query_vectors, k)
+
+        report = {
+            "size": size,
+            "dimension": dimension,
+            "k": k,
+            "M": M,
+            "ef_construction": ef_construction,
+            "build_seconds": round(build_seconds, 3),
+            "exact": {
+                "p50_ms": percentile_ms(exact_latencies, 50),
+                "p95_ms": percentile_ms(exact_latencies, 95),
+            },
+            "hnsw": [],
+        }
+
+        for ef_search in ef_search_values:
+            hnsw.ef_search = ef_search
+            approximate, latencies = search_ids(hnsw, query_vectors, k)
+            recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approximate, exact)])
+            report["hnsw"].append({
+                "ef_search": ef_search,
+                "recall": round(float(recall), 4),
+                "p50_ms": percentile_ms(latencies, 50),
+                "p95_ms": percentile_ms(latencies, 95),
+            })
+
+    return report
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--M", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=200)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    args = parser.parse_args()
+
+    report = run(
+        size=args.size,
+        dimension=args.dimension,
+        queries=args.queries,
+        k=args.k,
+        M=args.M,
+        ef_construction=args.ef_construction,
+        ef_search_values=args.ef_search
+    )
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
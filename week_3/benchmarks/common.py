@@ -0,0 +1,101 @@
+"""Helpers shared by the benchmarks."""
+import hashlib
+import resource
+import sys
+import time
+from typing import List, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from core.numpy_store import NumpyVectorStore
+
+class HashEmbeddings(Embeddings):
+    """Deterministic fake embeddings seeded by a hash of each text, so benchmarks run without a network."""
+
+    def __init__(self, dimension: int=384):
+        self.dimension = dimension
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+def peak_rss_mb() -> float:
+    """Get the peak resident set size of this process so far, in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def make_pdf(pages: List[List[str]]) -> bytes:
+    """Build a minimal PDF with one page per list of text lines"""
+    def escape(line: str) -> str:
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    font = 3 + 2 * len(pages)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(len(pages)))}] /Count {len(pages)} >>",
+    ]
+    for i, lines in enumerate(pages):
+        stream = "BT /F1 10 Tf 12 TL 50 750 Td " + " ".join(f"({escape(line)}) Tj T*" for line in lines) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    content, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+
+    xref = len(content)
+    content += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    content += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    content += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return content
+
+def clustered_vectors(rng: np.random.Generator, count: int, dimension: int, clusters: int=100) -> np.ndarray:
+    """Generate vectors grouped around random centres, closer to real embeddings than uniform noise"""
+    centres = rng.normal(size=(clusters, dimension)).astype(np.float32)
+    noise = rng.normal(scale=0.3, size=(count, dimension)).astype(np.float32)
+    return centres[rng.integers(0, clusters, size=count)] + noise
+
+WORDS = (
+    "the council said budget transit report market growth quarter analyst video speaker question "
+    "answer model data network revenue policy court contract clause party payment 2024 15% $3.2bn"
+).split()
+
+def synthetic_text(rng: np.random.Generator, characters: int, paragraphs: bool=True) -> str:
+    """
+    Generate roughly `characters` of text made of sentences, lines and paragraphs,
+    or of sentences on one line like an auto-generated transcript
+    """
+    blocks, size = [], 0
+    while size < characters:
+        lines = []
+        for _ in range(int(rng.integers(1, 4))):
+            words = rng.choice(WORDS, size=int(rng.integers(8, 60)))
+            lines.append(" ".join(words).capitalize() + ".")
+        blocks.append(("\n" if paragraphs else " ").join(lines))
+        size += len(blocks[-1]) + 2
+    return ("\n\n" if paragraphs else " ").join(blocks)[:characters]
+
+def percentile_ms(latencies: List[float], percentile: float) -> float:
+    """Get a latency percentile in milliseconds"""
+    return round(float(np.percentile(latencies, percentile) * 1000), 4)
+
+def search_ids(store: NumpyVectorStore, queries: np.ndarray, k: int) -> Tuple[List[List[str]], List[float]]:
+    """Run every query against a store, returning the result IDs and per-query latency"""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        documents = store.similarity_search_with_score_by_vector(query.tolist(), k=k)
+        latencies.append(time.perf_counter() - start)
+        results.append([document.id for document, _ in documents])
+    return results, latencies
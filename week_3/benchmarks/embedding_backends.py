@@ -0,0 +1,73 @@
+"""
+Throughput and agreement of the CPU backends for local embedding models.
+
+Encodes the same synthetic chunks with every backend and reports chunks per
+second and the cosine similarity of each vector to the fp32 torch baseline.
+
+Run from the week_3 directory:
+
+    python -m benchmarks.embedding_backends --model all-MiniLM-L6-v2 --chunks 2000
+"""
+import argparse
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.common import WORDS
+from core.embeddings import HuggingFaceModelCache, ParallelHuggingFaceEmbeddings
+from utils.model_util import SUPPORTED_HUGGINGFACE_BACKENDS
+
+def run(model_name: str, chunks: int, batch_size: int, backends: List[str], seed: int=0) -> Dict:
+    """Encode the chunks with every backend and compare against torch fp32"""
+    rng = np.random.default_rng(seed)
+    # Chunks of roughly the size the splitter produces
+    texts = [" ".join(rng.choice(WORDS, size=180)) for _ in range(chunks)]
+    report = {"model": model_name, "chunks": chunks, "batch_size": batch_size, "backends": []}
+    baseline = None
+
+    for backend in backends:
+        start = time.perf_counter()
+        embedder = ParallelHuggingFaceEmbeddings(HuggingFaceModelCache.load(model_name, backend), batch_size=batch_size)
+        load_seconds = time.perf_counter() - start
+
+        # Warm up so one-off graph and kernel setup is not timed
+        embedder.embed_documents(texts[:batch_size])
+
+        start = time.perf_counter()
+        vectors = np.asarray(embedder.embed_documents(texts), dtype=np.float32)
+        seconds = time.perf_counter() - start
+
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        if baseline is None:
+            baseline = vectors
+        agreement = np.sum(vectors * baseline, axis=1)
+
+        report["backends"].append({
+            "backend": backend,
+            "load_seconds": round(load_seconds, 3),
+            "chunks_per_second": round(chunks / seconds, 1),
+            "cosine_mean": round(float(agreement.mean()), 5),
+            "cosine_min": round(float(agreement.min()), 5),
+        })
+
+    return report
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=SUPPORTED_HUGGINGFACE_BACKENDS,
+        help="Backends to compare; the first one is the baseline."
+    )
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.model, args.chunks, args.batch_size, args.backends), indent=2))
+
+if __name__ == "__main__":
+    main()
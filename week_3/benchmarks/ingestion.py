@@ -0,0 +1,208 @@
+"""
+Where ingestion time goes: load, split and store generated PDFs, transcripts and
+articles of increasing size, with deterministic fake embeddings and no network.
+
+Articles are fetched from a local HTTP server and parsed; transcripts are served
+from the transcript cache, which is what a repeat YouTube ingest costs. Every
+run works in a fresh temporary directory. Run from the week_3 directory:
+
+    python -m benchmarks.ingestion --scales 1 10 100 --backend chroma
+
+The report ends with the peak resident set size of the whole run. With
+--trace-memory, each stage also reports the peak of the Python and NumPy
+allocations it made (tracemalloc), which slows every stage down.
+"""
+import argparse
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List
+
+import numpy as np
+from langchain_core.documents import Document
+
+from benchmarks.common import HashEmbeddings, make_pdf, peak_rss_mb, synthetic_text
+from core.document_cache import TRANSCRIPT_CACHE_PATH, get_document_cache
+from core.splitter import SUPPORTED_TEXT_SPLITTERS
+from core.storage import SUPPORTED_VECTOR_BACKENDS, VectorStore
+
+# Size of each kind of source at scale 1
+PDF_PAGES = 10
+TRANSCRIPT_CHARACTERS = 50_000
+ARTICLE_CHARACTERS = 10_000
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+@contextmanager
+def fixture_server(directory: str) -> Iterator[str]:
+    """Serve a directory over HTTP on localhost, yielding the base URL"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=directory))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+
+def write_pdf(rng: np.random.Generator, pages: int) -> str:
+    """Write a PDF of `pages` pages of text, returning its path"""
+    content = []
+    for _ in range(pages):
+        text = synthetic_text(rng, 3000, paragraphs=False)
+        content.append([text[start:start + 90] for start in range(0, len(text), 90)])
+
+    path = os.path.abspath(f"fixtures/document-{pages}.pdf")
+    with open(path, "wb") as file:
+        file.write(make_pdf(content))
+    return path
+
+def write_article(rng: np.random.Generator, characters: int) -> str:
+    """Write an HTML article of about `characters` of text, returning its file name"""
+    paragraphs = synthetic_text(rng, characters).split("\n\n")
+    body = "".join(f"<p>{paragraph}</p>" for paragraph in paragraphs)
+    name = f"article-{characters}.html"
+    with open(os.path.join("fixtures", name), "w", encoding="utf-8") as file:
+        file.write(f"<html><head><title>Article {characters}</title></head><body><article>{body}</article></body></html>")
+    return name
+
+def cache_transcript(rng: np.random.Generator, characters: int, scale: int) -> str:
+    """Put a generated transcript in the transcript cache, returning the URL of its video"""
+    video_id = f"bench{scale:06d}"
+    document = Document(page_content=synthetic_text(rng, characters, paragraphs=False), metadata={"source": video_id})
+    get_document_cache(TRANSCRIPT_CACHE_PATH, ttl=None).put(video_id, documents=[document])
+    return f"https://youtu.be/{video_id}"
+
+@contextmanager
+def measure(stages: Dict, name: str, trace_memory: bool) -> Iterator[None]:
+    """Record the duration of a stage and, when tracing, the peak memory it allocated"""
+    if trace_memory:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    yield
+    stages[name] = {"seconds": time.perf_counter() - start}
+    if trace_memory:
+        stages[name]["peak_alloc_mb"] = round((tracemalloc.get_traced_memory()[1] - baseline) / (1024 * 1024), 1)
+
+def ingest(store: VectorStore, source: str, source_type: str, trace_memory: bool=False) -> Dict:
+    """Run the load, split and store stages on one source, timing each"""
+    stages = {}
+
+    with measure(stages, "load", trace_memory):
+        documents = store.load_document(source, source_type)
+
+    with measure(stages, "split", trace_memory):
+        chunks = store.process_documents(documents)
+
+    with measure(stages, "store", trace_memory):
+        stats = store.add_chunks(chunks)
+
+    total = sum(stage["seconds"] for stage in stages.values())
+    for stage in stages.values():
+        stage["seconds"] = round(stage["seconds"], 4)
+
+    return {
+        "characters": sum(len(document.page_content) for document in documents),
+        "chunks": len(chunks),
+        "added": stats.added,
+        "seconds": round(total, 4),
+        "chunks_per_second": round(len(chunks) / total, 1) if total else None,
+        "stages": stages,
+    }
+
+def run(
+    scales: List[int],
+    backend: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    splitter: str,
+    dimension: int,
+    trace_memory: bool=False,
+    seed: int=0
+) -> Dict:
+    """Ingest each kind of source at each scale into a fresh store"""
+    report = {
+        "backend": backend,
+        "splitter": splitter,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "dimension": dimension,
+        "trace_memory": trace_memory,
+        "runs": [],
+    }
+    rng = np.random.default_rng(seed)
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Stores and caches use paths relative to the working directory
+        os.chdir(directory)
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            os.makedirs("fixtures")
+            with fixture_server(os.path.join(directory, "fixtures")) as base_url:
+                store = VectorStore(
+                    collection_name="ingestion-benchmark",
+                    embedding_provider="HuggingFace",
+                    embedding_model_name="all-MiniLM-L6-v2",
+                    chunk_size=chunk_size,
+                    chunk_overlap=chunk_overlap,
+                    backend=backend,
+                    splitter=splitter
+                )
+                store.embeddingClient.embedder = HashEmbeddings(dimension)
+                store.load_store()
+
+                for scale in scales:
+                    sources = [
+                        ("pdf", write_pdf(rng, PDF_PAGES * scale)),
+                        ("youtube", cache_transcript(rng, TRANSCRIPT_CHARACTERS * scale, scale)),
+                        ("news", f"{base_url}/{write_article(rng, ARTICLE_CHARACTERS * scale)}"),
+                    ]
+                    for source_type, source in sources:
+                        report["runs"].append({
+                            "source_type": source_type,
+                            "scale": scale,
+                            **ingest(store, source, source_type, trace_memory)
+                        })
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+            os.chdir(cwd)
+
+    # The high-water mark only ever grows, so it describes the whole run rather than a stage
+    report["peak_rss_mb"] = peak_rss_mb()
+    return report
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--backend", default=SUPPORTED_VECTOR_BACKENDS[0], choices=SUPPORTED_VECTOR_BACKENDS)
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--splitter", default=SUPPORTED_TEXT_SPLITTERS[0], choices=SUPPORTED_TEXT_SPLITTERS)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--trace-memory", action="store_true", help="Report the peak memory allocated by each stage")
+    args = parser.parse_args()
+
+    report = run(
+        args.scales,
+        args.backend,
+        args.chunk_size,
+        args.chunk_overlap,
+        args.splitter,
+        args.dimension,
+        args.trace_memory
+    )
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
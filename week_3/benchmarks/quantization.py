@@ -0,0 +1,88 @@
+"""
+Size, load time, latency and recall of quantized vector storage against float32.
+
+Run from the week_3 directory:
+
+    python -m benchmarks.quantization --size 200000 --dimension 1536
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from benchmarks.common import clustered_vectors, percentile_ms, search_ids
+from core.numpy_store import VECTORS_FILE, NumpyVectorStore
+
+# (dtype, rescore) pairs compared against the float32 baseline
+MODES = [
+    ("float32", False),
+    ("float16", False),
+    ("int8", False),
+    ("int8", True),
+]
+
+def build(directory: str, vectors: np.ndarray, dtype: str, rescore: bool, batch_size: int=10_000) -> None:
+    """Write the vectors into a new collection"""
+    store = NumpyVectorStore("bench", None, directory, dtype=dtype, rescore=rescore)
+    for offset in range(0, len(vectors), batch_size):
+        batch = vectors[offset:offset + batch_size]
+        store.add_embeddings(
+            texts=[""] * len(batch),
+            embeddings=batch,
+            ids=[str(row) for row in range(offset, offset + len(batch))]
+        )
+
+def run(size: int, dimension: int, queries: int, k: int, seed: int=0) -> Dict:
+    """Build a collection per mode over the same vectors and compare them with float32"""
+    rng = np.random.default_rng(seed)
+    vectors = clustered_vectors(rng, size, dimension)
+    query_vectors = clustered_vectors(rng, queries, dimension)
+
+    report = {"size": size, "dimension": dimension, "k": k, "modes": []}
+    baseline: List[List[str]] = []
+
+    for dtype, rescore in MODES:
+        with tempfile.TemporaryDirectory() as directory:
+            build(directory, vectors, dtype, rescore)
+
+            # Opening maps the files; the first scan pages the searched matrix in
+            start = time.perf_counter()
+            store = NumpyVectorStore("bench", None, directory, dtype=dtype, rescore=rescore)
+            store.similarity_search_with_score_by_vector(query_vectors[0].tolist(), k=k)
+            load_seconds = time.perf_counter() - start
+
+            results, latencies = search_ids(store, query_vectors, k)
+            if not baseline:
+                baseline = results
+            recall = np.mean([len(set(r) & set(b)) / len(b) for r, b in zip(results, baseline)])
+
+            searched_files = [name for name in store._matrix_files() if not (rescore and name == VECTORS_FILE)]
+            report["modes"].append({
+                "dtype": dtype,
+                "rescore": rescore,
+                "searched_bytes": sum(os.path.getsize(os.path.join(store.directory, name)) for name in searched_files),
+                "total_bytes": sum(os.path.getsize(os.path.join(store.directory, name)) for name in store._matrix_files()),
+                "load_seconds": round(load_seconds, 4),
+                "p50_ms": percentile_ms(latencies, 50),
+                "p95_ms": percentile_ms(latencies, 95),
+                "recall": round(float(recall), 4),
+            })
+
+    return report
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=4)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.size, args.dimension, args.queries, args.k), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Retrieval latency, load time and disk size of a VectorStore collection as it grows.
+
+Each backend's collection is filled through `add_chunks` with synthetic passages and
+deterministic fake embeddings, growing from the smallest size to the largest. At every
+size the HNSW graph is saved, the store is reopened from disk with every cached client
+dropped, and `as_retriever().invoke` is timed, including the fake query embedding.
+Run from the week_3 directory:
+
+    python -m benchmarks.retrieval_latency --sizes 1000 10000 100000 1000000 --backends numpy hnsw chroma
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+from chromadb.api.client import SharedSystemClient
+from langchain_core.documents import Document
+
+from benchmarks.common import WORDS, HashEmbeddings, percentile_ms
+from core.registry import store_registry
+from core.retention import disk_usage
+from core.storage import SUPPORTED_VECTOR_BACKENDS, VectorStore
+
+COLUMNS = ["backend", "size", "fill_seconds", "load_seconds", "disk_mb", "p50_ms", "p95_ms", "p99_ms"]
+
+def open_store(backend: str, dimension: int) -> VectorStore:
+    """Open the benchmark collection with fake embeddings"""
+    store = VectorStore(
+        collection_name="latency-benchmark",
+        embedding_provider="HuggingFace",
+        embedding_model_name="all-MiniLM-L6-v2",
+        backend=backend
+    )
+    store.embeddingClient.embedder = HashEmbeddings(dimension)
+    return store
+
+def passages(rng: np.random.Generator, start: int, stop: int) -> List[Document]:
+    """Generate short synthetic passages numbered [start, stop)"""
+    return [
+        Document(
+            page_content=f"Passage {number}: " + " ".join(rng.choice(WORDS, size=16)),
+            metadata={"source": f"source-{number // 100}"}
+        )
+        for number in range(start, stop)
+    ]
+
+def run(backends: List[str], sizes: List[int], queries: int, k: int, dimension: int, batch_size: int, seed: int=0) -> Dict:
+    """Grow a collection per backend, measuring it at every size"""
+    report = {"dimension": dimension, "k": k, "queries": queries, "rows": []}
+    cwd = os.getcwd()
+
+    for backend in backends:
+        rng = np.random.default_rng(seed)
+        query_texts = [" ".join(rng.choice(WORDS, size=8)) for _ in range(queries)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            # Stores use paths relative to the working directory
+            os.chdir(directory)
+            try:
+                store = open_store(backend, dimension)
+                store.load_store()
+                filled = 0
+
+                for size in sorted(sizes):
+                    start = time.perf_counter()
+                    for offset in range(filled, size, batch_size):
+                        store.add_chunks(passages(rng, offset, min(offset + batch_size, size)))
+                    fill_seconds = time.perf_counter() - start
+                    filled = size
+
+                    # Reopen from disk so load time covers reading the collection back
+                    if hasattr(store.store, "persist"):
+                        store.store.persist()
+                    store_registry.clear()
+                    SharedSystemClient.clear_system_cache()
+                    start = time.perf_counter()
+                    store = open_store(backend, dimension)
+                    store.load_store()
+                    retriever = store.as_retriever(search_kwargs={"k": k})
+                    retriever.invoke(query_texts[0])
+                    load_seconds = time.perf_counter() - start
+
+                    latencies = []
+                    for query in query_texts:
+                        start = time.perf_counter()
+                        retriever.invoke(query)
+                        latencies.append(time.perf_counter() - start)
+
+                    report["rows"].append({
+                        "backend": backend,
+                        "size": size,
+                        "fill_seconds": round(fill_seconds, 2),
+                        "load_seconds": round(load_seconds, 4),
+                        "disk_mb": round(disk_usage(store.persist_directory) / 1e6, 1),
+                        "p50_ms": percentile_ms(latencies, 50),
+                        "p95_ms": percentile_ms(latencies, 95),
+                        "p99_ms": percentile_ms(latencies, 99),
+                    })
+            finally:
+                store_registry.clear()
+                os.chdir(cwd)
+
+    return report
+
+def table(rows: List[Dict]) -> str:
+    """Format the report rows as a Markdown table"""
+    lines = [
+        "| " + " | ".join(COLUMNS) + " |",
+        "|" + "|".join("---" for _ in COLUMNS) + "|",
+    ]
+    lines += ["| " + " | ".join(str(row[column]) for column in COLUMNS) + " |" for row in rows]
+    return "\n".join(lines)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--backends", nargs="+", default=SUPPORTED_VECTOR_BACKENDS, choices=SUPPORTED_VECTOR_BACKENDS)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON instead of a table")
+    args = parser.parse_args()
+
+    report = run(args.backends, args.sizes, args.queries, args.k, args.dimension, args.batch_size)
+    print(json.dumps(report, indent=2) if args.json else table(report["rows"]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Throughput of FastTextSplitter against RecursiveCharacterTextSplitter,
+on a one-line transcript and on an article made of paragraphs.
+
+Lengths are measured in characters, and in tokens too when the tiktoken
+encoding can be loaded. Run from the week_3 directory:
+
+    python -m benchmarks.splitters --characters 5000000 --chunk-size 1024 --chunk-overlap 200
+"""
+import argparse
+import json
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+from langchain_text_splitters import RecursiveCharacterTextSplitter, TextSplitter
+
+from benchmarks.common import synthetic_text
+from core.splitter import FastTextSplitter
+
+def measure(splitter: TextSplitter, text: str, length: Callable[[str], int], repeat: int) -> Dict:
+    """Split the text `repeat` times, keeping the best wall time"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = splitter.split_text(text)
+        best = min(best, time.perf_counter() - start)
+
+    lengths = [length(chunk) for chunk in chunks]
+    return {
+        "seconds": round(best, 4),
+        "mb_per_second": round(len(text.encode("utf-8")) / best / 1e6, 2),
+        "chunks": len(chunks),
+        "mean_length": round(float(np.mean(lengths)), 1),
+        "max_length": max(lengths),
+    }
+
+SHAPES = {
+    "transcript": False,
+    "article": True,
+}
+
+def run(characters: int, chunk_size: int, chunk_overlap: int, encoding: str, repeat: int, seed: int=0) -> Dict:
+    """Split the same synthetic texts with each splitter and unit"""
+    report = {"characters": characters, "chunk_size": chunk_size, "chunk_overlap": chunk_overlap, "runs": []}
+
+    splitters: List = [
+        ("recursive", "characters", lambda: RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap), len),
+        ("fast", "characters", lambda: FastTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap), len),
+    ]
+    try:
+        import tiktoken
+        tokenizer = tiktoken.get_encoding(encoding)
+        count_tokens = lambda chunk: len(tokenizer.encode_ordinary(chunk))
+        splitters += [
+            ("recursive", encoding, lambda: RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+                encoding_name=encoding, chunk_size=chunk_size, chunk_overlap=chunk_overlap), count_tokens),
+            ("fast", encoding, lambda: FastTextSplitter(
+                chunk_size=chunk_size, chunk_overlap=chunk_overlap, encoding=tokenizer), count_tokens),
+        ]
+    except Exception as e:
+        # The encoding is downloaded on first use
+        report["skipped"] = f"token lengths: {e.__class__.__name__}: {e}"
+
+    for shape, paragraphs in SHAPES.items():
+        # Transcripts come as one line of sentences, articles as paragraphs
+        text = synthetic_text(np.random.default_rng(seed), characters, paragraphs=paragraphs)
+        for name, unit, create, length in splitters:
+            report["runs"].append({
+                "text": shape,
+                "splitter": name,
+                "unit": unit,
+                **measure(create(), text, length, repeat)
+            })
+
+    return report
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--characters", type=int, default=5_000_000)
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--encoding", default="cl100k_base")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.characters, args.chunk_size, args.chunk_overlap, args.encoding, args.repeat), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+ARTICLE_CACHE_PATH = "data/article_cache.sqlite"
+TRANSCRIPT_CACHE_PATH = "data/transcript_cache.sqlite"
+
+class DocumentCache:
+    def __init__(
+        self,
+        path: str=ARTICLE_CACHE_PATH,
+        ttl: Optional[float]=7 * 24 * 3600,
+        max_bytes: int=256 * 1024 * 1024
+    ):
+        """
+        Initialize the DocumentCache.
+
+        Each entry holds the raw content fetched for a key (e.g. an article's HTML)
+        and the documents parsed from it, in a SQLite file. Entries expire `ttl`
+        seconds after they were stored and are evicted in least-recently-used order
+        once the cache grows past `max_bytes`.
+
+        Args:
+            path (str): The path of the SQLite file backing the cache.
+            ttl (Optional[float]): The lifetime of an entry in seconds, or None to keep entries until evicted.
+            max_bytes (int): The maximum total size of the raw content and documents to keep.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                key TEXT PRIMARY KEY,
+                raw TEXT,
+                documents TEXT,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS documents_last_access ON documents (last_access)"
+        )
+        self.__connection.commit()
+        self.__size = self.__connection.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+
+    @staticmethod
+    def dump_documents(documents: List[Document]) -> str:
+        """Serialize documents to JSON, storing metadata that is not JSON as strings"""
+        return json.dumps(
+            [{"page_content": document.page_content, "metadata": document.metadata} for document in documents],
+            default=str
+        )
+
+    @staticmethod
+    def load_documents(data: str) -> List[Document]:
+        """Deserialize documents from JSON"""
+        return [Document(page_content=item["page_content"], metadata=item["metadata"]) for item in json.loads(data)]
+
+    def __expired(self, created: float, now: float) -> bool:
+        """Check whether an entry stored at `created` has outlived the TTL"""
+        return self.ttl is not None and now - created > self.ttl
+
+    def __delete(self, key: str) -> None:
+        """Delete an entry, keeping the size counter in sync"""
+        row = self.__connection.execute("SELECT size FROM documents WHERE key = ?", (key,)).fetchone()
+        if row:
+            self.__connection.execute("DELETE FROM documents WHERE key = ?", (key,))
+            self.__size -= row[0]
+
+    def get(self, key: str) -> Tuple[Optional[str], Optional[List[Document]]]:
+        """
+        Look up an entry
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            Tuple[Optional[str], Optional[List[Document]]]: The raw content and the parsed documents,
+                each None if it is not cached or the entry expired.
+        """
+        now = time.time()
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT raw, documents, created FROM documents WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or self.__expired(row[2], now):
+                if row is not None:
+                    self.__delete(key)
+                    self.__connection.commit()
+                self.misses += 1
+                return None, None
+
+            self.__connection.execute("UPDATE documents SET last_access = ? WHERE key = ?", (now, key))
+            self.__connection.commit()
+            raw, documents = row[0], row[1]
+            if documents is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return raw, self.load_documents(documents) if documents is not None else None
+
+    def put(self, key: str, raw: Optional[str]=None, documents: Optional[List[Document]]=None) -> None:
+        """
+        Store an entry, replacing any previous one for the same key
+
+        Args:
+            key (str): The key of the entry.
+            raw (Optional[str]): The raw content the documents were parsed from.
+            documents (Optional[List[Document]]): The parsed documents.
+        """
+        data = self.dump_documents(documents) if documents is not None else None
+        size = len((raw or "").encode("utf-8")) + len((data or "").encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self.__lock:
+            self.__delete(key)
+            self.__connection.execute(
+                "INSERT INTO documents (key, raw, documents, size, created, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, raw, data, size, now, now)
+            )
+            self.__size += size
+            self.__evict(now)
+            self.__connection.commit()
+
+    def __evict(self, now: float) -> None:
+        """Drop expired entries, then the least recently used ones until the cache fits in `max_bytes`"""
+        if self.ttl is not None:
+            self.__connection.execute("DELETE FROM documents WHERE created < ?", (now - self.ttl,))
+
+        if self.ttl is not None or self.__size > self.max_bytes:
+            self.__size = self.__connection.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+
+        while self.__size > self.max_bytes:
+            key, size = self.__connection.execute(
+                "SELECT key, size FROM documents ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            self.__connection.execute("DELETE FROM documents WHERE key = ?", (key,))
+            self.__size -= size
+
+    def stats(self) -> Dict[str, float]:
+        """Get the cache size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        with self.__lock:
+            entries = self.__connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        return {
+            "entries": entries,
+            "bytes": self.__size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+_caches: Dict[str, DocumentCache] = {}
+_caches_lock = threading.Lock()
+
+def get_document_cache(path: str=ARTICLE_CACHE_PATH, **kwargs) -> DocumentCache:
+    """Get the process-wide document cache stored at `path`, created with `kwargs` on first use"""
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = DocumentCache(path, **kwargs)
+        return _caches[path]
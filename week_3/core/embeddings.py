@@ -1,22 +1,622 @@
-from typing import List, Optional
+import asyncio
+import functools
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
 
+import openai
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_openai import OpenAIEmbeddings
 
 from config.settings import env_config
+from core.query_cache import query_cache
 from utils.model_util import (
+    OPENAI_EMBEDDING_MODELS_WITH_DIMENSIONS,
     SUPPORTED_EMBEDDING_PROVIDERS,
+    SUPPORTED_HUGGINGFACE_BACKENDS,
     SUPPORTED_OPENAI_EMBEDDING_MODELS
 )
 
+EMBEDDING_CACHE_PATH = "data/embedding_cache.sqlite"
+
+class EmbeddingCache:
+    def __init__(self, path: str=EMBEDDING_CACHE_PATH, max_entries: int=200_000):
+        """
+        Initialize the EmbeddingCache.
+
+        Vectors are stored as float32 blobs in a SQLite file and evicted in
+        least-recently-used order once `max_entries` is exceeded.
+
+        Args:
+            path (str): The path of the SQLite file backing the cache.
+            max_entries (int): The maximum number of vectors to keep.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                provider TEXT NOT NULL,
+                model_name TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (provider, model_name, text_hash)
+            )
+            """
+        )
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access)"
+        )
+        self.__connection.commit()
+        self.__size = self.__connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Hash a text into its cache key"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(
+        self,
+        provider: str,
+        model_name: str,
+        text_hashes: List[str],
+        count: bool=True
+    ) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors
+
+        Args:
+            provider (str): The embedding provider.
+            model_name (str): The embedding model name.
+            text_hashes (List[str]): The hashes of the texts to look up.
+            count (bool): Whether the lookup adds to the hit/miss counters. Callers combining several lookups
+                for the same texts count them once with `record_lookups`.
+
+        Returns:
+            Dict[str, List[float]]: The cached vectors keyed by text hash.
+        """
+        found = {}
+        unique_hashes = list(dict.fromkeys(text_hashes))
+
+        with self.__lock:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(unique_hashes), 500):
+                batch = unique_hashes[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.__connection.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE provider = ? AND model_name = ? AND text_hash IN ({placeholders})",
+                    [provider, model_name, *batch]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[text_hash] = vector.tolist()
+
+            if found:
+                now = time.time()
+                self.__connection.executemany(
+                    "UPDATE embeddings SET last_access = ? "
+                    "WHERE provider = ? AND model_name = ? AND text_hash = ?",
+                    [(now, provider, model_name, text_hash) for text_hash in found]
+                )
+                self.__connection.commit()
+
+            if count:
+                self.hits += sum(1 for text_hash in text_hashes if text_hash in found)
+                self.misses += sum(1 for text_hash in text_hashes if text_hash not in found)
+
+        return found
+
+    def record_lookups(self, hits: int, misses: int) -> None:
+        """
+        Add to the hit/miss counters
+
+        Args:
+            hits (int): The number of texts found in the cache.
+            misses (int): The number of texts that had to be embedded.
+        """
+        with self.__lock:
+            self.hits += hits
+            self.misses += misses
+
+    def put_many(self, provider: str, model_name: str, vectors: Dict[str, List[float]]) -> None:
+        """
+        Store vectors in the cache
+
+        Args:
+            provider (str): The embedding provider.
+            model_name (str): The embedding model name.
+            vectors (Dict[str, List[float]]): The vectors to store keyed by text hash.
+        """
+        if not vectors:
+            return
+
+        now = time.time()
+        with self.__lock:
+            before = self.__connection.total_changes
+            self.__connection.executemany(
+                "INSERT OR IGNORE INTO embeddings (provider, model_name, text_hash, vector, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (provider, model_name, text_hash, array("f", vector).tobytes(), now)
+                    for text_hash, vector in vectors.items()
+                ]
+            )
+            self.__size += self.__connection.total_changes - before
+
+            if self.__size > self.max_entries:
+                self.__connection.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY last_access LIMIT ?)",
+                    (self.__size - self.max_entries,)
+                )
+                self.__size = self.max_entries
+
+            self.__connection.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Get the cache size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.__size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+class CachedEmbeddings(Embeddings):
+    def __init__(
+        self,
+        embedder: Embeddings,
+        cache: EmbeddingCache,
+        provider: str,
+        model_name: str,
+        dimensions: Optional[int]=None,
+        full_model_name: Optional[str]=None
+    ):
+        """
+        Initialize the CachedEmbeddings.
+
+        Args:
+            embedder (Embeddings): The embedding model to compute cache misses with.
+            cache (EmbeddingCache): The cache to read from and write to.
+            provider (str): The provider of the embedding model.
+            model_name (str): The name the vectors are cached under.
+            dimensions (Optional[int]): The size of shortened vectors, if the model is asked for them.
+            full_model_name (Optional[str]): The name full-size vectors of the same model are cached under.
+                Cached full-size vectors are truncated and renormalized instead of being requested again.
+        """
+        self.embedder = embedder
+        self.cache = cache
+        self.provider = provider
+        self.model_name = model_name
+        self.dimensions = dimensions
+        self.full_model_name = full_model_name
+
+    @staticmethod
+    def shorten(vector: List[float], dimensions: int) -> List[float]:
+        """Truncate a vector and renormalize it to unit length"""
+        shortened = vector[:dimensions]
+        norm = math.sqrt(sum(value * value for value in shortened)) or 1.0
+        return [value / norm for value in shortened]
+
+    def __lookup(self, texts: List[str]) -> Tuple[List[str], Dict[str, List[float]], Dict[str, str]]:
+        """Get the cached vectors of texts, and the texts that still have to be embedded"""
+        text_hashes = [EmbeddingCache.text_hash(text) for text in texts]
+        vectors = self.cache.get_many(self.provider, self.model_name, text_hashes, count=False)
+
+        missing = {}
+        for text, text_hash in zip(texts, text_hashes):
+            if text_hash not in vectors:
+                missing.setdefault(text_hash, text)
+
+        if missing and self.dimensions and self.full_model_name:
+            full_vectors = self.cache.get_many(self.provider, self.full_model_name, list(missing), count=False)
+            shortened = {
+                text_hash: self.shorten(vector, self.dimensions) for text_hash, vector in full_vectors.items()
+            }
+            self.cache.put_many(self.provider, self.model_name, shortened)
+            vectors.update(shortened)
+            missing = {text_hash: text for text_hash, text in missing.items() if text_hash not in shortened}
+
+        # Count each text once, whichever lookup found it
+        hits = sum(1 for text_hash in text_hashes if text_hash in vectors)
+        self.cache.record_lookups(hits, len(text_hashes) - hits)
+
+        return text_hashes, vectors, missing
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, only calling the model for texts not in the cache"""
+        text_hashes, vectors, missing = self.__lookup(texts)
+
+        if missing:
+            computed = dict(zip(missing, self.embedder.embed_documents(list(missing.values()))))
+            self.cache.put_many(self.provider, self.model_name, computed)
+            vectors.update(computed)
+
+        return [vectors[text_hash] for text_hash in text_hashes]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed documents, only calling the model for texts not in the cache"""
+        text_hashes, vectors, missing = await asyncio.to_thread(self.__lookup, texts)
+
+        if missing:
+            computed = dict(zip(missing, await self.embedder.aembed_documents(list(missing.values()))))
+            await asyncio.to_thread(self.cache.put_many, self.provider, self.model_name, computed)
+            vectors.update(computed)
+
+        return [vectors[text_hash] for text_hash in text_hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query text, reusing the embedding of a recent identical question"""
+        embedding = query_cache.get_embedding((self.provider, self.model_name), text)
+        if embedding is None:
+            embedding = self.embedder.embed_query(text)
+            query_cache.put_embedding((self.provider, self.model_name), text, embedding)
+        return embedding
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Asynchronously embed a query text, reusing the embedding of a recent identical question"""
+        embedding = query_cache.get_embedding((self.provider, self.model_name), text)
+        if embedding is None:
+            embedding = await self.embedder.aembed_query(text)
+            query_cache.put_embedding((self.provider, self.model_name), text, embedding)
+        return embedding
+
+class BatchedEmbeddings(Embeddings):
+    def __init__(
+        self,
+        embedder: Embeddings,
+        batch_size: int=256,
+        max_workers: int=4,
+        max_retries: int=3,
+        retry_delay: float=1.0
+    ):
+        """
+        Initialize the BatchedEmbeddings.
+
+        Args:
+            embedder (Embeddings): The embedding model to send the batches to.
+            batch_size (int): The number of texts per request.
+            max_workers (int): The number of batches embedded in parallel.
+            max_retries (int): The number of times a batch failing with a transient error
+                (rate limit, connection, timeout or server error) is retried. Other errors are raised at once.
+            retry_delay (float): The initial delay in seconds between retries, doubled on each attempt.
+        """
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+    @staticmethod
+    def __is_transient(error: Exception) -> bool:
+        """Whether a failed request may succeed when retried"""
+        if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+            # APIConnectionError also covers timeouts
+            return True
+        return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+    def __embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a single batch, retrying transient errors with exponential backoff"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.embedder.embed_documents(texts)
+            except Exception as error:
+                if attempt == self.max_retries or not self.__is_transient(error):
+                    raise
+                time.sleep(self.retry_delay * 2 ** attempt)
+
+    async def __aembed_batch(self, texts: List[str], semaphore: asyncio.Semaphore) -> List[List[float]]:
+        """Asynchronously embed a single batch, retrying transient errors with exponential backoff"""
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return await self.embedder.aembed_documents(texts)
+                except Exception as error:
+                    if attempt == self.max_retries or not self.__is_transient(error):
+                        raise
+                    await asyncio.sleep(self.retry_delay * 2 ** attempt)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents in batches spread over a bounded thread pool"""
+        batches = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        if len(batches) <= 1 or self.max_workers <= 1:
+            return [vector for batch in batches for vector in self.__embed_batch(batch)]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            results = executor.map(self.__embed_batch, batches)
+            return [vector for batch in results for vector in batch]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronously embed documents in batches, at most `max_workers` in flight"""
+        semaphore = asyncio.Semaphore(max(self.max_workers, 1))
+        batches = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(self.__aembed_batch(batch, semaphore) for batch in batches))
+        return [vector for batch in results for vector in batch]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query text"""
+        return self.embedder.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Asynchronously embed a query text"""
+        return await self.embedder.aembed_query(text)
+
+class HuggingFaceModelCache:
+    def __init__(self, idle_timeout: Optional[float]=600.0):
+        """
+        Initialize the HuggingFaceModelCache.
+
+        Loaded models are shared by every client using the same model name and
+        backend, and reference counted. Models nobody holds are dropped once they have been
+        idle for `idle_timeout` seconds. A model is loaded outside the cache lock, so other
+        models stay available meanwhile, and concurrent requests for it wait for that one load.
+        The worker pools encoding large inputs are also shared, started once per model and
+        worker count, and stopped when the model is dropped.
+
+        Args:
+            idle_timeout (Optional[float]): Seconds an unused model is kept in memory. None keeps it forever.
+        """
+        self.idle_timeout = idle_timeout
+        self.__lock = threading.Lock()
+        self.__models: Dict[Tuple[str, str], HuggingFaceEmbeddings] = {}
+        self.__references: Dict[Tuple[str, str], int] = {}
+        self.__released_at: Dict[Tuple[str, str], float] = {}
+        self.__loading: Dict[Tuple[str, str], Future] = {}
+        self.__pools: Dict[Tuple[str, str, int], Tuple[Dict, threading.Lock]] = {}
+        self.__pools_lock = threading.Lock()
+
+    @staticmethod
+    def load(model_name: str, backend: str=SUPPORTED_HUGGINGFACE_BACKENDS[0]) -> HuggingFaceEmbeddings:
+        """
+        Load a model on the given CPU inference backend
+
+        Args:
+            model_name (str): The name of the HuggingFace model.
+            backend (str): "torch" (fp32), "torch-int8" (dynamically quantized linear layers)
+                or "onnx" (ONNX Runtime, requires `optimum[onnxruntime]`).
+
+        Returns:
+            HuggingFaceEmbeddings: The loaded model.
+        """
+        if backend == "onnx":
+            return HuggingFaceEmbeddings(model_name=model_name, model_kwargs={"backend": "onnx"})
+
+        model = HuggingFaceEmbeddings(model_name=model_name)
+        if backend == "torch-int8":
+            import torch
+
+            torch.ao.quantization.quantize_dynamic(model._client, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        elif backend != "torch":
+            raise ValueError(f"Unsupported HuggingFace backend: {backend}")
+
+        return model
+
+    def acquire(self, model_name: str, backend: str=SUPPORTED_HUGGINGFACE_BACKENDS[0]) -> HuggingFaceEmbeddings:
+        """
+        Get the shared model, loading it on first use
+
+        Args:
+            model_name (str): The name of the HuggingFace model.
+            backend (str): The CPU inference backend of the model.
+
+        Returns:
+            HuggingFaceEmbeddings: The loaded model.
+        """
+        self.evict_idle()
+        key = (model_name, backend)
+        while True:
+            with self.__lock:
+                if key in self.__models:
+                    return self.__hold(key)
+
+                loading = key in self.__loading
+                if not loading:
+                    self.__loading[key] = Future()
+                future = self.__loading[key]
+
+            if loading:
+                # Wait for the load another caller started, then take a reference like a cache hit
+                future.result()
+                continue
+
+            try:
+                model = self.load(model_name, backend)
+            except BaseException as error:
+                with self.__lock:
+                    del self.__loading[key]
+                future.set_exception(error)
+                raise
+
+            with self.__lock:
+                self.__models[key] = model
+                self.__references[key] = 0
+                del self.__loading[key]
+                held = self.__hold(key)
+            future.set_result(model)
+            return held
+
+    def __hold(self, key: Tuple[str, str]) -> HuggingFaceEmbeddings:
+        """Add a reference to a loaded model, with the lock held"""
+        self.__references[key] += 1
+        self.__released_at.pop(key, None)
+        return self.__models[key]
+
+    def release(self, model_name: str, backend: str=SUPPORTED_HUGGINGFACE_BACKENDS[0]) -> None:
+        """
+        Drop a reference to a shared model
+
+        Args:
+            model_name (str): The name of the HuggingFace model.
+            backend (str): The CPU inference backend of the model.
+        """
+        key = (model_name, backend)
+        with self.__lock:
+            if self.__references.get(key, 0) <= 0:
+                return
+            self.__references[key] -= 1
+            if self.__references[key] == 0:
+                self.__released_at[key] = time.monotonic()
+        self.evict_idle()
+
+    @contextmanager
+    def pool(self, model_name: str, backend: str, workers: int) -> Iterator[Dict]:
+        """
+        Use the worker pool of a held model, starting it on first use
+
+        The pool is used by one caller at a time, since its queues are shared by every call.
+
+        Args:
+            model_name (str): The name of the HuggingFace model.
+            backend (str): The CPU inference backend of the model.
+            workers (int): The number of worker processes.
+
+        Returns:
+            Iterator[Dict]: The sentence-transformers process pool.
+        """
+        key = (model_name, backend, workers)
+        with self.__pools_lock:
+            with self.__lock:
+                model = self.__models[(model_name, backend)]
+                entry = self.__pools.get(key)
+
+            if entry is None:
+                entry = (self.__start_pool(model, workers), threading.Lock())
+                with self.__lock:
+                    self.__pools[key] = entry
+
+        pool, lock = entry
+        with lock:
+            yield pool
+
+    @staticmethod
+    def __start_pool(model: HuggingFaceEmbeddings, workers: int) -> Dict:
+        """Start CPU worker processes sharing the cores, rather than each using all of them"""
+        threads = os.environ.get("OMP_NUM_THREADS")
+        # Spawned workers read the variable when torch starts
+        os.environ["OMP_NUM_THREADS"] = str(max(1, (os.cpu_count() or 1) // workers))
+        try:
+            return model._client.start_multi_process_pool(["cpu"] * workers)
+        finally:
+            if threads is None:
+                del os.environ["OMP_NUM_THREADS"]
+            else:
+                os.environ["OMP_NUM_THREADS"] = threads
+
+    def evict_idle(self) -> int:
+        """
+        Drop the models that nobody has held for longer than the idle timeout, and stop their pools
+
+        Returns:
+            int: The number of models dropped.
+        """
+        if self.idle_timeout is None:
+            return 0
+
+        now = time.monotonic()
+        with self.__lock:
+            idle = [key for key, released_at in self.__released_at.items() if now - released_at >= self.idle_timeout]
+            models = {key: self.__models.pop(key) for key in idle}
+            for key in idle:
+                del self.__references[key]
+                del self.__released_at[key]
+            pools = [
+                (models[key[:2]], self.__pools.pop(key)) for key in list(self.__pools) if key[:2] in models
+            ]
+
+        for model, (pool, lock) in pools:
+            with lock:
+                model._client.stop_multi_process_pool(pool)
+        return len(idle)
+
+    def stats(self) -> Dict[str, int]:
+        """Get the reference count of every loaded model"""
+        with self.__lock:
+            return {f"{model_name}@{backend}": references for (model_name, backend), references in self.__references.items()}
+
+huggingface_model_cache = HuggingFaceModelCache()
+
+class ParallelHuggingFaceEmbeddings(Embeddings):
+    def __init__(
+        self,
+        model: HuggingFaceEmbeddings,
+        batch_size: int=32,
+        max_workers: int=1,
+        pool: Optional[Callable[[], ContextManager[Dict]]]=None
+    ):
+        """
+        Initialize the ParallelHuggingFaceEmbeddings.
+
+        Args:
+            model (HuggingFaceEmbeddings): The (shared) loaded model.
+            batch_size (int): The number of texts encoded per forward pass.
+            max_workers (int): The number of CPU worker processes used for large inputs.
+            pool (Optional[Callable[[], ContextManager[Dict]]]): Gives the long-lived process pool of the model,
+                such as `HuggingFaceModelCache.pool`. Without it, every input is encoded in this process.
+        """
+        self.model = model
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.pool = pool
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, using the process pool when the input spans several batches per worker"""
+        client = self.model._client
+        texts = [text.replace("\n", " ") for text in texts]
+        if self.pool is None or self.max_workers <= 1 or len(texts) < self.batch_size * self.max_workers:
+            return client.encode(texts, batch_size=self.batch_size, **self.model.encode_kwargs).tolist()
+
+        with self.pool() as pool:
+            embeddings = client.encode_multi_process(texts, pool, batch_size=self.batch_size)
+
+        return embeddings.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query text"""
+        return self.model.embed_query(text)
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+def get_embedding_cache(path: str=EMBEDDING_CACHE_PATH) -> EmbeddingCache:
+    """Get the process-wide embedding cache stored at `path`"""
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = EmbeddingCache(path)
+        return _caches[path]
+
 class EmbeddingClient:
     def __init__(
         self,
         provider=SUPPORTED_EMBEDDING_PROVIDERS[0],
         model_name=SUPPORTED_OPENAI_EMBEDDING_MODELS[0],
-        api_key: Optional[str]=None
+        api_key: Optional[str]=None,
+        cache: Optional[EmbeddingCache]=None,
+        use_cache: bool=True,
+        batch_size: int=256,
+        max_workers: int=4,
+        max_retries: int=3,
+        backend: str=SUPPORTED_HUGGINGFACE_BACKENDS[0],
+        dimensions: Optional[int]=None
     ):
         """
         Initialize the EmbeddingClient.
@@ -24,12 +624,75 @@ class EmbeddingClient:
         Args:
             provider (str): The provider to use for the embedding model. Defaults to "openai" ("openai" or "huggingface").
             model_name (str): The name of the model to use for the embedding model. Defaults to "text-embedding-3-small".
-            api_key (Optional[str]): Provider API key (falls back to environment variable if not provided).
+            api_key (Optional[str]): Provider API key (falls back to environment variable when first needed).
+            cache (Optional[EmbeddingCache]): The embedding cache to use. Defaults to the shared on-disk cache.
+            use_cache (bool): Whether to cache computed embeddings. Defaults to True.
+            batch_size (int): The number of texts embedded per request or encoding pass. Defaults to 256.
+            max_workers (int): The number of parallel requests (OpenAI) or encoding processes (HuggingFace). Defaults to 4.
+            max_retries (int): The number of times an OpenAI batch failing with a transient error is retried. Defaults to 3.
+            backend (str): The CPU inference backend for HuggingFace models ("torch", "torch-int8" or "onnx").
+                Defaults to "torch".
+            dimensions (Optional[int]): The size of shortened embeddings, for models that support them
+                ("text-embedding-3-small" and "text-embedding-3-large"). Defaults to the full size.
         """
+        if backend not in SUPPORTED_HUGGINGFACE_BACKENDS:
+            raise ValueError(f"Unsupported HuggingFace backend: {backend}")
+        if dimensions is not None and model_name not in OPENAI_EMBEDDING_MODELS_WITH_DIMENSIONS:
+            raise ValueError(f"The embedding model {model_name} does not support shortened embeddings")
+        if dimensions is not None and not 0 < dimensions <= OPENAI_EMBEDDING_MODELS_WITH_DIMENSIONS[model_name]:
+            raise ValueError(
+                f"The embedding model {model_name} supports 1 to "
+                f"{OPENAI_EMBEDDING_MODELS_WITH_DIMENSIONS[model_name]} dimensions, got {dimensions}"
+            )
+
         self.provider = provider
         self.model_name = model_name
-        self.__api_key = api_key or self.__get_api_key()
-        self.embedder = self.__initialize_embedder()
+        self.__api_key = api_key
+        self.cache = (cache or get_embedding_cache()) if use_cache else None
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backend = backend
+        self.dimensions = dimensions
+        self.__embedder = None
+        self.__embedder_lock = threading.Lock()
+        self.__release = None
+
+    @property
+    def embedder(self) -> Embeddings:
+        """The embedding model, created on first use"""
+        if self.__embedder is None:
+            with self.__embedder_lock:
+                if self.__embedder is None:
+                    self.__embedder = self.__initialize_embedder()
+        return self.__embedder
+
+    @embedder.setter
+    def embedder(self, embedder: Embeddings) -> None:
+        self.__embedder = embedder
+
+    @property
+    def model_id(self) -> str:
+        """Identify the model and, for optimized local backends, how it runs, since their vectors differ slightly"""
+        if self.provider == SUPPORTED_EMBEDDING_PROVIDERS[1] and self.backend != SUPPORTED_HUGGINGFACE_BACKENDS[0]:
+            return f"{self.model_name}@{self.backend}"
+        if self.dimensions:
+            return f"{self.model_name}@{self.dimensions}d"
+        return self.model_name
+
+    @property
+    def cache_key(self) -> Tuple[str, str, str]:
+        """Identify the embedding model and credentials, without exposing the API key"""
+        api_key = self.__resolve_api_key()
+        fingerprint = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12] if api_key else ""
+        return (self.provider, self.model_id, fingerprint)
+
+    def __resolve_api_key(self) -> Optional[str]:
+        """Get the API key, reading the environment the first time it is needed"""
+        # A blank key, as from an empty text field, falls back to the environment too
+        if not self.__api_key:
+            self.__api_key = self.__get_api_key()
+        return self.__api_key
 
     def __get_api_key(self) -> str:
         """Get API key from environment variables"""
@@ -42,13 +705,54 @@ class EmbeddingClient:
     def __initialize_embedder(self) -> Embeddings:
         """Create the embedding model instance based on the provider and model_name"""
         if self.provider == SUPPORTED_EMBEDDING_PROVIDERS[0]:
-            return OpenAIEmbeddings(model=self.model_name, api_key=self.__api_key)
+            embedder = BatchedEmbeddings(
+                OpenAIEmbeddings(
+                    model=self.model_name,
+                    api_key=self.__resolve_api_key(),
+                    chunk_size=self.batch_size,
+                    dimensions=self.dimensions,
+                    # Retries are handled per batch by BatchedEmbeddings, not multiplied with the client's own
+                    max_retries=0
+                ),
+                batch_size=self.batch_size,
+                max_workers=self.max_workers,
+                max_retries=self.max_retries
+            )
         elif self.provider == SUPPORTED_EMBEDDING_PROVIDERS[1]:
-            return HuggingFaceEmbeddings(model_name=self.model_name)
+            # Share the loaded weights with every other client of the same model
+            embedder = ParallelHuggingFaceEmbeddings(
+                huggingface_model_cache.acquire(self.model_name, self.backend),
+                batch_size=self.batch_size,
+                max_workers=self.max_workers,
+                pool=functools.partial(huggingface_model_cache.pool, self.model_name, self.backend, self.max_workers)
+            )
+            # Held as long as the embedder is reachable, e.g. from a shared store handle outliving this client
+            self.__release = weakref.finalize(embedder, huggingface_model_cache.release, self.model_name, self.backend)
         else:
             raise ValueError(f"Unsupported embedding provider: {self.provider}")
+
+        if self.cache:
+            return CachedEmbeddings(
+                embedder,
+                self.cache,
+                self.provider,
+                self.model_id,
+                dimensions=self.dimensions,
+                full_model_name=self.model_name
+            )
+
+        return embedder
         
+    def close(self) -> None:
+        """Release the shared local model now, rather than once the embedder is no longer reachable"""
+        if self.__release is not None:
+            self.__release()
+
     def generate_embeddings(self, texts: List[Document]) -> List[float]:
         """Generate embeddings for a list of text documents"""
         return self.embedder.embed_documents(texts)
-    
\ No newline at end of file
+
+    async def agenerate_embeddings(self, texts: List[Document]) -> List[float]:
+        """Asynchronously generate embeddings for a list of text documents"""
+        return await self.embedder.aembed_documents(texts)
+    
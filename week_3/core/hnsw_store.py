@@ -0,0 +1,163 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import hnswlib
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from core.numpy_store import SUPPORTED_VECTOR_DTYPES, NumpyVectorStore
+
+INDEX_FILE = "index.hnsw"
+
+class HNSWVectorStore(NumpyVectorStore):
+    def __init__(
+        self,
+        collection_name: str,
+        embedding_function: Embeddings,
+        persist_directory: str,
+        M: int=16,
+        ef_construction: int=200,
+        ef_search: int=64,
+        save_every: int=10_000,
+        dtype: str=SUPPORTED_VECTOR_DTYPES[0],
+        rescore: Optional[bool]=None
+    ):
+        """
+        Initialize the HNSWVectorStore.
+
+        Vectors are stored exactly like the NumpyVectorStore; an HNSW graph over
+        them answers queries approximately instead of scanning every row.
+
+        Args:
+            collection_name (str): The name of the collection.
+            embedding_function (Embeddings): The embedding model used for texts and queries.
+            persist_directory (str): The directory holding the collections.
+            M (int): The number of graph links per element. Higher improves recall and uses more memory.
+            ef_construction (int): The candidate list size while building. Higher improves graph quality.
+            ef_search (int): The candidate list size while searching. Higher improves recall and latency.
+            save_every (int): The number of inserts after which the graph is saved to disk.
+            dtype (str): The storage type of the vectors on disk (see NumpyVectorStore).
+                The graph itself always holds float32 copies.
+            rescore (Optional[bool]): Whether filtered searches rescore their candidates with float32 vectors
+                (see NumpyVectorStore).
+        """
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.save_every = save_every
+
+        super().__init__(collection_name, embedding_function, persist_directory, dtype=dtype, rescore=rescore)
+
+    def _reset(self) -> None:
+        """Forget every loaded row and the graph over them"""
+        super()._reset()
+        self._index: Optional[hnswlib.Index] = None
+        self._unsaved = 0
+
+    def _load(self) -> None:
+        """Load the flat collection, then the graph, inserting any rows it is missing"""
+        super()._load()
+        if not self.dimension:
+            return
+
+        self._index = hnswlib.Index(space="ip", dim=self.dimension)
+        rows = len(self._ids)
+        if os.path.exists(self._path(INDEX_FILE)):
+            self._index.load_index(self._path(INDEX_FILE), max_elements=max(rows, 1))
+            if self._index.get_current_count() > rows:
+                # The collection shrank since the graph was saved
+                self._build_index()
+                return
+        else:
+            self._index.init_index(max_elements=max(rows, 1), ef_construction=self.ef_construction, M=self.M)
+
+        self._insert_rows(self._index.get_current_count(), rows)
+        if self._unsaved:
+            self.persist()
+
+    def _build_index(self) -> None:
+        """Build the graph from scratch over every row"""
+        self._index = hnswlib.Index(space="ip", dim=self.dimension)
+        self._index.init_index(max_elements=max(len(self._ids), 1), ef_construction=self.ef_construction, M=self.M)
+        self._insert_rows(0, len(self._ids))
+        self.persist()
+
+    def _insert_rows(self, start: int, stop: int) -> None:
+        """Insert the matrix rows [start, stop) into the graph"""
+        if stop <= start:
+            return
+
+        if stop > self._index.get_max_elements():
+            # Grow geometrically so frequent small inserts do not resize every time
+            self._index.resize_index(max(stop, 2 * self._index.get_max_elements()))
+
+        self._index.add_items(self._vectors(np.arange(start, stop)), np.arange(start, stop))
+        self._unsaved += stop - start
+
+    def _rows_appended(self, start: int) -> None:
+        """Insert the rows another process appended into the graph"""
+        if self._index is None:
+            self._build_index()
+        else:
+            self._insert_rows(start, len(self._ids))
+
+    def persist(self) -> None:
+        """Save the graph to disk"""
+        with self._lock, self._file_lock:
+            # Never overwrite the graph of a collection another process rewrote
+            self._sync()
+            if self._index is not None:
+                self._index.save_index(self._path(INDEX_FILE))
+                self._unsaved = 0
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]]=None,
+        ids: Optional[List[str]]=None,
+        embedding_model: Optional[str]=None
+    ) -> List[str]:
+        """Add texts with precomputed embeddings and insert them into the graph"""
+        with self._lock, self._file_lock:
+            self._sync()
+            start = len(self._ids)
+            added = super().add_embeddings(texts, embeddings, metadatas=metadatas, ids=ids, embedding_model=embedding_model)
+            if not added:
+                return added
+
+            if self._index is None:
+                self._build_index()
+            else:
+                self._insert_rows(start, len(self._ids))
+                if self._unsaved >= self.save_every:
+                    self.persist()
+
+        return added
+
+    def _rewrite(self, vectors: Optional[np.ndarray]) -> None:
+        """Rewrite the collection and rebuild the graph, since rows were renumbered"""
+        super()._rewrite(vectors)
+        if self._matrix is None:
+            self._index = None
+            if os.path.exists(self._path(INDEX_FILE)):
+                os.remove(self._path(INDEX_FILE))
+        else:
+            self._build_index()
+
+    def _search(self, query: np.ndarray, k: int, rows: Optional[np.ndarray]=None) -> List[Tuple[int, float]]:
+        """Find approximately the k rows with the highest cosine similarity to a normalized query"""
+        if rows is not None:
+            # A filtered search only touches a few rows, so scanning them exactly is cheaper than the graph
+            return super()._search(query, k, rows)
+
+        with self._lock:
+            if self._index is None or k <= 0:
+                return []
+
+            k = min(k, self._index.get_current_count())
+            self._index.set_ef(max(self.ef_search, k))
+            labels, distances = self._index.knn_query(query, k=k)
+
+        # Inner-product distance is 1 - similarity
+        return [(int(row), 1.0 - float(distance)) for row, distance in zip(labels[0], distances[0])]
@@ -0,0 +1,317 @@
+import heapq
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+from filelock import FileLock
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from core.numpy_store import SOURCE_ID_KEY
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into lowercase word and number tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+class BM25Index:
+    def __init__(self, path: Optional[str]=None, k1: float=1.5, b: float=0.75):
+        """
+        Initialize the BM25Index.
+
+        An in-process inverted index over the chunks of one collection, scored
+        with Okapi BM25. Chunks are appended to a JSON lines file and the index
+        is rebuilt from it when opened. Writes hold a lock file, and every call
+        first catches up with other processes writing the same file.
+
+        Args:
+            path (Optional[str]): The JSON lines file persisting the chunks, or None to keep them in memory only.
+            k1 (float): The term frequency saturation.
+            b (float): The document length normalization.
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._file_lock = None
+        self._reset()
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file_lock = FileLock(path + ".lock")
+            self._sync()
+
+    def _reset(self) -> None:
+        """Forget every indexed chunk"""
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._lengths: List[int] = []
+        self._rows: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._total_length = 0
+        self._generation = 0
+        self._offset = 0
+        self._stamp = None
+
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        """Identify the state of the index file, which every append or rewrite changes"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _read_generation(self) -> int:
+        """Read how many times the index file was rewritten"""
+        try:
+            with open(self.path + ".generation") as file:
+                return int(file.read() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _sync(self) -> None:
+        """Catch up with another process writing the index file: read the chunks it appended, or reload after a rewrite"""
+        if not self.path or self._file_stamp() == self._stamp:
+            return
+
+        with self._lock, self._file_lock:
+            stamp = self._file_stamp()
+            if stamp == self._stamp:
+                return
+
+            generation = self._read_generation()
+            if generation != self._generation or stamp is None or stamp[1] < self._offset:
+                self._reset()
+                self._generation = generation
+
+            if stamp is not None:
+                with open(self.path, "rb") as file:
+                    file.seek(self._offset)
+                    for line in file:
+                        record = json.loads(line)
+                        self._index(record["id"], record["text"], record["metadata"])
+                    self._offset = file.tell()
+            self._stamp = self._file_stamp()
+
+    def _index(self, id: str, text: str, metadata: Dict[str, Any]) -> None:
+        """Add one chunk to the in-memory index"""
+        row = len(self._ids)
+        terms = Counter(tokenize(text))
+
+        self._ids.append(id)
+        self._texts.append(text)
+        self._metadatas.append(metadata)
+        self._lengths.append(sum(terms.values()))
+        self._rows[id] = row
+        self._total_length += self._lengths[row]
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[row] = frequency
+
+    def __contains__(self, id: str) -> bool:
+        self._sync()
+        return id in self._rows
+
+    def count(self) -> int:
+        """Get the number of indexed chunks"""
+        self._sync()
+        return len(self._ids)
+
+    def add_documents(self, documents: List[Document], ids: List[str]) -> int:
+        """
+        Index chunks, skipping the ones already indexed
+
+        Args:
+            documents (List[Document]): The chunks to index.
+            ids (List[str]): The IDs of the chunks, as stored in the vector store.
+
+        Returns:
+            int: The number of chunks added.
+        """
+        with self._lock, self._file_lock or nullcontext():
+            self._sync()
+            records = []
+            for document, id in zip(documents, ids):
+                if id in self._rows:
+                    continue
+                self._index(id, document.page_content, document.metadata)
+                records.append({"id": id, "text": document.page_content, "metadata": document.metadata})
+
+            if records and self.path:
+                with open(self.path, "ab") as file:
+                    for record in records:
+                        file.write((json.dumps(record, default=str) + "\n").encode("utf-8"))
+                    self._offset = file.tell()
+                self._stamp = self._file_stamp()
+
+        return len(records)
+
+    def delete(self, ids: List[str]) -> int:
+        """
+        Remove chunks from the index and rewrite its file
+
+        Args:
+            ids (List[str]): The IDs of the chunks to remove.
+
+        Returns:
+            int: The number of chunks removed.
+        """
+        with self._lock, self._file_lock or nullcontext():
+            self._sync()
+            removed = set(ids) & self._rows.keys()
+            if not removed:
+                return 0
+
+            records = [
+                (id, text, metadata)
+                for id, text, metadata in zip(self._ids, self._texts, self._metadatas)
+                if id not in removed
+            ]
+            generation = self._generation
+            self._reset()
+            self._generation = generation
+            for record in records:
+                self._index(*record)
+
+            if self.path:
+                with open(self.path + ".tmp", "wb") as file:
+                    for id, text, metadata in records:
+                        record = {"id": id, "text": text, "metadata": metadata}
+                        file.write((json.dumps(record, default=str) + "\n").encode("utf-8"))
+                    self._offset = file.tell()
+                os.replace(self.path + ".tmp", self.path)
+
+                # Tells other processes to reload instead of reading on from their old offset
+                self._generation += 1
+                with open(self.path + ".generation", "w") as file:
+                    file.write(str(self._generation))
+                self._stamp = self._file_stamp()
+
+        return len(removed)
+
+    def search(self, query: str, k: int=4, source_ids: Optional[List[str]]=None) -> List[Tuple[Document, float]]:
+        """
+        Find the chunks with the highest BM25 score for a query
+
+        Args:
+            query (str): The query text.
+            k (int): The number of chunks to return.
+            source_ids (Optional[List[str]]): Only search the chunks of these sources.
+
+        Returns:
+            List[Tuple[Document, float]]: The chunks and their scores, best first. Chunks sharing no term with
+                the query are never returned.
+        """
+        allowed = set(source_ids) if source_ids else None
+        scores: Dict[int, float] = {}
+        self._sync()
+
+        with self._lock:
+            if not self._ids or k <= 0:
+                return []
+
+            documents = len(self._ids)
+            average_length = self._total_length / documents or 1.0
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+
+                idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                for row, frequency in postings.items():
+                    if allowed is not None and self._metadatas[row].get(SOURCE_ID_KEY) not in allowed:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[row] / average_length)
+                    scores[row] = scores.get(row, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+            top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [
+                (Document(id=self._ids[row], page_content=self._texts[row], metadata=dict(self._metadatas[row])), score)
+                for row, score in top
+            ]
+
+class LexicalRetriever(BaseRetriever):
+    """Retrieves chunks from a BM25Index, without embedding the query."""
+
+    index: Any
+    k: int = 4
+    source_ids: Optional[List[str]] = None
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return [document for document, _ in self.index.search(query, k=self.k, source_ids=self.source_ids)]
+
+class HybridRetriever(BaseRetriever):
+    """
+    Fuses a vector retriever and a lexical retriever with reciprocal rank fusion.
+
+    A chunk scores sum(weight / (rrf_k + rank)) over the result lists it appears in.
+    Queries wrapped in double quotes skip the vector search and only run the lexical one.
+    """
+
+    vector_retriever: BaseRetriever
+    lexical_retriever: LexicalRetriever
+    k: int = 4
+    rrf_k: int = 60
+    vector_weight: float = 1.0
+    lexical_weight: float = 1.0
+
+    @staticmethod
+    def quoted(query: str) -> Optional[str]:
+        """Get the text of a query wrapped in double quotes, or None"""
+        query = query.strip()
+        if len(query) > 2 and query[0] == query[-1] == '"':
+            return query[1:-1]
+        return None
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        phrase = self.quoted(query)
+        if phrase is not None:
+            # Lexical fast path: an exact phrase needs no embedding call
+            return [document for document, _ in self.lexical_retriever.index.search(
+                phrase, k=self.k, source_ids=self.lexical_retriever.source_ids
+            )]
+
+        callbacks = run_manager.get_child()
+        return self.fuse([
+            (self.vector_retriever.invoke(query, config={"callbacks": callbacks}), self.vector_weight),
+            (self.lexical_retriever.invoke(query, config={"callbacks": callbacks}), self.lexical_weight),
+        ])
+
+    def fuse(self, rankings: List[Tuple[List[Document], float]]) -> List[Document]:
+        """
+        Merge ranked result lists with reciprocal rank fusion
+
+        Args:
+            rankings (List[Tuple[List[Document], float]]): Each result list, best first, with its weight.
+
+        Returns:
+            List[Document]: The top `k` chunks of the fused ranking.
+        """
+        scores: Dict[str, float] = {}
+        documents: Dict[str, Document] = {}
+        for ranking, weight in rankings:
+            for rank, document in enumerate(ranking, start=1):
+                # Both indexes store a chunk under the same ID, so equal texts of different chunks stay apart
+                key = document.id
+                scores[key] = scores.get(key, 0.0) + weight / (self.rrf_k + rank)
+                documents.setdefault(key, document)
+
+        top = heapq.nlargest(self.k, scores.items(), key=lambda item: item[1])
+        return [documents[key] for key, _ in top]
@@ -1,14 +1,18 @@
-from typing import Optional
+import threading
+from typing import List, Optional
 
 from langchain_classic.chains.conversational_retrieval.base import ConversationalRetrievalChain
 from langchain_classic.memory import ConversationBufferMemory
 from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
 from langchain_core.language_models import BaseChatModel
+from langchain_core.retrievers import BaseRetriever
 from langchain_core.runnables import RunnableSequence
 from langchain_groq import ChatGroq
 from langchain_openai import ChatOpenAI
 
 from config.settings import env_config
+from core.storage import SOURCE_ID_KEY, SUPPORTED_RETRIEVAL_MODES
 from utils.model_util import (
     SUPPORTED_GROQ_MODELS,
     SUPPORTED_OPENAI_MODELS,
@@ -21,7 +25,9 @@ class LLMClient:
         provider: str=SUPPORTED_LLM_PROVIDERS[0],
         model_name: str=SUPPORTED_OPENAI_MODELS[0],
         api_key: Optional[str]=None,
-        store: Chroma=None
+        store: Chroma=None,
+        retrieval_mode: str=SUPPORTED_RETRIEVAL_MODES[0],
+        cache_queries: bool=True
     ):
         """
         Initialize the LLMClient.
@@ -31,14 +37,47 @@ class LLMClient:
             model_name (str): The name of the model to use for the LLM. Defaults to "gpt-5-nano-2025-08-07"
             system_prompt (str): The system prompt to use for the LLM. Defaults to "You are a helpful assistant."
             api_key (Optional[str]): Provider API key (falls back to environment variable if not provided).
+            retrieval_mode (str): How follow-up questions retrieve chunks: "vector" (embedding similarity),
+                "hybrid" (vector and BM25 fused) or "lexical" (BM25 only, no embedding call). Defaults to "vector".
+            cache_queries (bool): Whether repeated questions reuse the chunks retrieved for them last time,
+                until the collection changes.
         """
+        if retrieval_mode not in SUPPORTED_RETRIEVAL_MODES:
+            raise ValueError(f"Unsupported retrieval mode: {retrieval_mode}")
+
         self.provider = provider
         self.model_name = model_name
         self.store = store
+        self.retrieval_mode = retrieval_mode
+        self.cache_queries = cache_queries
 
         self.__api_key = api_key or self.__get_api_key()
-        self.llm = self.__initialize_llm()
-        self.qa_chain = self.__create_qa_chain()
+        self.__llm = None
+        self.__qa_chain = None
+        self.__source_ids = []
+        self.__lock = threading.RLock()
+
+    @property
+    def llm(self) -> BaseChatModel:
+        """The chat model, created on first use"""
+        if self.__llm is None:
+            with self.__lock:
+                if self.__llm is None:
+                    self.__llm = self.__initialize_llm()
+        return self.__llm
+
+    @property
+    def qa_chain(self) -> ConversationalRetrievalChain:
+        """The conversational retrieval chain, created on the first follow-up question"""
+        if self.__qa_chain is None:
+            with self.__lock:
+                if self.__qa_chain is None:
+                    self.__qa_chain = self.__create_qa_chain()
+
+        if self.__source_ids:
+            # A follow-up question counts as an access for the retention policy
+            self.store.touch_sources(self.__source_ids)
+        return self.__qa_chain
 
     def __get_api_key(self) -> str:
         """Get API key from environment variables"""
@@ -77,6 +116,50 @@ class LLMClient:
 
         return ConversationalRetrievalChain.from_llm(
             llm=self.llm,
-            retriever=self.store.as_retriever(),
+            retriever=self.__create_retriever(),
             memory=memory
         )
+
+    def __create_retriever(self) -> BaseRetriever:
+        """Create the retriever for the current sources"""
+        if self.retrieval_mode == "hybrid":
+            retriever = self.store.as_hybrid_retriever(self.__source_ids)
+        elif self.retrieval_mode == "lexical":
+            retriever = self.store.as_lexical_retriever(self.__source_ids)
+        elif self.__source_ids:
+            retriever = self.store.as_source_retriever(self.__source_ids)
+        else:
+            retriever = self.store.as_retriever()
+
+        if self.cache_queries:
+            search_key = (self.retrieval_mode, tuple(self.__source_ids))
+            retriever = self.store.as_cached_retriever(retriever, search_key)
+        return retriever
+
+    def set_sources(self, source_ids: Optional[List[str]]=None) -> None:
+        """
+        Scope follow-up questions to the chunks of the given sources
+
+        Args:
+            source_ids (Optional[List[str]]): The IDs of the sources to search. Searches the whole collection if empty.
+        """
+        with self.__lock:
+            self.__source_ids = list(source_ids or [])
+            if self.__qa_chain is not None:
+                self.__qa_chain.retriever = self.__create_retriever()
+
+    def set_document_sources(self, documents: List[Document]) -> List[str]:
+        """
+        Scope follow-up questions to the sources of the given chunks
+
+        Args:
+            documents (List[Document]): The processed chunks, tagged with their source ID.
+
+        Returns:
+            List[str]: The distinct source IDs, in order of first appearance.
+        """
+        source_ids = list(dict.fromkeys(
+            document.metadata[SOURCE_ID_KEY] for document in documents if SOURCE_ID_KEY in document.metadata
+        ))
+        self.set_sources(source_ids)
+        return source_ids
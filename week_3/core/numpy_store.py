@@ -0,0 +1,688 @@
+import json
+import os
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from filelock import FileLock
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore as BaseVectorStore
+
+VECTORS_FILE = "vectors.f32"
+HALF_VECTORS_FILE = "vectors.f16"
+INT8_VECTORS_FILE = "vectors.i8"
+SCALES_FILE = "scales.f32"
+RECORDS_FILE = "records.jsonl"
+INFO_FILE = "info.json"
+LOCK_FILE = "collection.lock"
+
+# Metadata key with a row index, so searches scoped to a source skip the rest of the collection
+SOURCE_ID_KEY = "source_id"
+
+SUPPORTED_VECTOR_DTYPES = [
+        "float32",
+        "float16",
+        "int8",
+]
+
+# Number of rows dequantized at a time while scoring, which bounds the temporary float32 copy
+SCORE_BLOCK_ROWS = 65_536
+
+class NumpyVectorStore(BaseVectorStore):
+    def __init__(
+        self,
+        collection_name: str,
+        embedding_function: Embeddings,
+        persist_directory: str,
+        dtype: str=SUPPORTED_VECTOR_DTYPES[0],
+        rescore: Optional[bool]=None,
+        rescore_factor: int=4
+    ):
+        """
+        Initialize the NumpyVectorStore.
+
+        Vectors are L2-normalized and kept in a contiguous matrix on disk,
+        which is memory-mapped for search. Texts and metadata are kept in a
+        JSON lines file next to it. Writes hold a lock file, and every call
+        first catches up with other processes: rows they appended are read,
+        and a rewrite (which bumps the generation in info.json) is reloaded.
+
+        Args:
+            collection_name (str): The name of the collection.
+            embedding_function (Embeddings): The embedding model used for texts and queries.
+            persist_directory (str): The directory holding the collections.
+            dtype (str): The storage type of the searched matrix ("float32", "float16", or "int8" with a scale
+                per vector). Fixed when the collection is created. Every search upcasts the matrix to float32
+                block by block, and NumPy converts float16 with no SIMD, so exact float16 search is many times
+                slower than float32 (about 25x at 20k x 256); int8 is half the size and only a few times slower.
+            rescore (Optional[bool]): Whether to also keep float32 vectors on disk and rescore the top candidates
+                with them. Fixed when the collection is created: None follows an existing collection (else False),
+                and a value conflicting with it raises a ValueError.
+            rescore_factor (int): The number of candidates rescored per requested result.
+        """
+        if dtype not in SUPPORTED_VECTOR_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+
+        self.collection_name = collection_name
+        self.embedding_function = embedding_function
+        self.directory = os.path.join(persist_directory, collection_name)
+        self.dimension = None
+        self.embedding_model = None
+        self.dtype = dtype
+        self.rescore = rescore
+        self._full_precision: Optional[bool] = None
+        self.rescore_factor = rescore_factor
+
+        self._lock = threading.RLock()
+        self._reset()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._file_lock = FileLock(self._path(LOCK_FILE))
+        with self._file_lock:
+            self._load()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding_function
+
+    def count(self) -> int:
+        """Get the number of documents in the collection"""
+        self._sync()
+        return len(self._ids)
+
+    def _path(self, file_name: str) -> str:
+        """Get the path of a file in the collection directory"""
+        return os.path.join(self.directory, file_name)
+
+    def _reset(self) -> None:
+        """Forget every loaded row"""
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._source_rows: Dict[str, List[int]] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._full: Optional[np.ndarray] = None
+        self._generation = 0
+        self._records_offset = 0
+        self._stamp = None
+
+    def _read_info(self) -> Dict[str, Any]:
+        """Read the settings of the collection, empty until vectors are first added"""
+        if not os.path.exists(self._path(INFO_FILE)):
+            return {}
+        with open(self._path(INFO_FILE)) as info_file:
+            return json.load(info_file)
+
+    def _load(self) -> None:
+        """Load the records and map the vector matrix of the collection"""
+        self._reset()
+        info = self._read_info()
+        if info:
+            self.dimension = info["dimension"]
+            self.embedding_model = info.get("embedding_model")
+            self._generation = info.get("generation", 0)
+            if info.get("dtype", "float32") != self.dtype:
+                raise ValueError(f"Collection {self.collection_name} stores {info.get('dtype', 'float32')} vectors, not {self.dtype}")
+
+            # Whether float32 vectors are kept is decided once, by whoever created the collection
+            self._full_precision = info.get("full_precision", True)
+            if self.dtype != "float32" and self.rescore is not None and self.rescore != self._full_precision:
+                if self.rescore:
+                    raise ValueError(f"Collection {self.collection_name} keeps no float32 vectors to rescore with")
+                raise ValueError(f"Collection {self.collection_name} was created with rescore=True, not rescore=False")
+
+        if self.rescore is None:
+            self.rescore = self.dtype != "float32" and bool(self._full_precision)
+
+        self._read_records()
+        self._map_matrix()
+
+    def _read_records(self) -> None:
+        """Read the records appended to the records file since it was last read"""
+        if not os.path.exists(self._path(RECORDS_FILE)):
+            return
+
+        with open(self._path(RECORDS_FILE), "rb") as records_file:
+            records_file.seek(self._records_offset)
+            for line in records_file:
+                record = json.loads(line)
+                self._append_record(record["id"], record["text"], record["metadata"])
+            self._records_offset = records_file.tell()
+        self._stamp = self._records_stamp()
+
+    def _records_stamp(self) -> Optional[Tuple[int, int, int]]:
+        """Identify the state of the records file, which every append or rewrite changes"""
+        try:
+            stat = os.stat(self._path(RECORDS_FILE))
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _sync(self) -> None:
+        """Catch up with another process writing the collection: read the rows it appended, or reload after a rewrite"""
+        if self._records_stamp() == self._stamp:
+            return
+
+        with self._lock, self._file_lock:
+            stamp = self._records_stamp()
+            if stamp == self._stamp:
+                return
+
+            info = self._read_info()
+            if (
+                info.get("generation", 0) != self._generation
+                or self.dimension is None
+                or stamp is None
+                or stamp[1] < self._records_offset
+            ):
+                self._load()
+            else:
+                start = len(self._ids)
+                self._read_records()
+                self._map_matrix()
+                self._rows_appended(start)
+
+    def _rows_appended(self, start: int) -> None:
+        """Called after rows [start, count) appended by another process were read"""
+
+    def _write_info(self) -> None:
+        """Write the settings the collection was created with"""
+        with open(self._path(INFO_FILE), "w") as info_file:
+            json.dump({
+                "dimension": self.dimension,
+                "dtype": self.dtype,
+                "full_precision": self._keeps_full_precision,
+                "embedding_model": self.embedding_model,
+                "generation": self._generation
+            }, info_file)
+
+    def _check_embedding_model(self, embedding_model: Optional[str]) -> None:
+        """Refuse vectors of another embedding model than the ones the collection holds"""
+        if embedding_model and self.embedding_model and embedding_model != self.embedding_model:
+            raise ValueError(
+                f"Collection {self.collection_name} holds vectors of {self.embedding_model}, not {embedding_model}"
+            )
+
+    @property
+    def _keeps_full_precision(self) -> bool:
+        """Whether float32 vectors are written alongside the searched matrix, as recorded once the collection exists"""
+        if self._full_precision is not None:
+            return self._full_precision
+        return self.dtype == "float32" or bool(self.rescore)
+
+    def _map_matrix(self) -> None:
+        """Memory-map the rows of the vector matrices that have a record"""
+        rows = len(self._ids)
+        if not rows or not self.dimension:
+            self._matrix = self._scales = self._full = None
+            return
+
+        shape = (rows, self.dimension)
+        self._full = None
+        if self._keeps_full_precision:
+            self._full = np.memmap(self._path(VECTORS_FILE), dtype=np.float32, mode="r", shape=shape)
+
+        if self.dtype == "float16":
+            self._matrix = np.memmap(self._path(HALF_VECTORS_FILE), dtype=np.float16, mode="r", shape=shape)
+        elif self.dtype == "int8":
+            self._matrix = np.memmap(self._path(INT8_VECTORS_FILE), dtype=np.int8, mode="r", shape=shape)
+            self._scales = np.memmap(self._path(SCALES_FILE), dtype=np.float32, mode="r", shape=(rows,))
+        else:
+            self._matrix = self._full
+
+    def _write_vectors(self, vectors: np.ndarray, suffix: str="", mode: str="ab") -> None:
+        """Write normalized float32 vectors to the matrix files, quantizing them as configured"""
+        if self._keeps_full_precision:
+            with open(self._path(VECTORS_FILE + suffix), mode) as vectors_file:
+                vectors_file.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+
+        if self.dtype == "float16":
+            with open(self._path(HALF_VECTORS_FILE + suffix), mode) as vectors_file:
+                vectors_file.write(np.ascontiguousarray(vectors, dtype=np.float16).tobytes())
+        elif self.dtype == "int8":
+            # Symmetric scalar quantization with one scale per vector
+            scales = np.abs(vectors).max(axis=1) / 127.0 if len(vectors) else np.zeros(0)
+            scales[scales == 0] = 1.0
+            quantized = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+            with open(self._path(INT8_VECTORS_FILE + suffix), mode) as vectors_file:
+                vectors_file.write(quantized.tobytes())
+            with open(self._path(SCALES_FILE + suffix), mode) as scales_file:
+                scales_file.write(scales.astype(np.float32).tobytes())
+
+    def _matrix_files(self) -> List[str]:
+        """Get the names of the matrix files of the collection"""
+        files = [VECTORS_FILE] if self._keeps_full_precision else []
+        if self.dtype == "float16":
+            files.append(HALF_VECTORS_FILE)
+        elif self.dtype == "int8":
+            files.extend([INT8_VECTORS_FILE, SCALES_FILE])
+        return files
+
+    def _vectors(self, rows: np.ndarray) -> np.ndarray:
+        """Get float32 vectors of the given rows, dequantizing them if needed"""
+        if self._full is not None:
+            return np.asarray(self._full[rows], dtype=np.float32)
+        if self.dtype == "int8":
+            return self._matrix[rows].astype(np.float32) * np.asarray(self._scales[rows])[:, None]
+        return self._matrix[rows].astype(np.float32)
+
+    def _append_record(self, id_: str, text: str, metadata: Dict[str, Any]) -> None:
+        """Append a record to the in-memory rows and indexes"""
+        row = len(self._ids)
+        self._rows[id_] = row
+        self._ids.append(id_)
+        self._texts.append(text)
+        self._metadatas.append(metadata)
+        if SOURCE_ID_KEY in metadata:
+            self._source_rows.setdefault(metadata[SOURCE_ID_KEY], []).append(row)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize the rows of a matrix"""
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]]=None,
+        ids: Optional[List[str]]=None,
+        embedding_model: Optional[str]=None
+    ) -> List[str]:
+        """
+        Add texts with precomputed embeddings to the collection
+
+        Args:
+            texts (List[str]): The texts to add.
+            embeddings (List[List[float]]): The embeddings of the texts.
+            metadatas (Optional[List[Dict[str, Any]]]): The metadata of each text.
+            ids (Optional[List[str]]): The IDs of the texts. Generated if not provided.
+            embedding_model (Optional[str]): Identifies the model the embeddings come from. Recorded with
+                the collection, which then refuses embeddings of any other model.
+
+        Returns:
+            List[str]: The IDs of the added texts.
+        """
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+        with self._lock, self._file_lock:
+            self._sync()
+
+            # Skip IDs that are already stored, like Chroma does
+            keep = [index for index, id_ in enumerate(ids) if id_ not in self._rows]
+            if not keep:
+                return []
+
+            self._check_embedding_model(embedding_model)
+            if self.dimension is not None and vectors.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match collection dimension {self.dimension}"
+                )
+            if self.dimension is None or (embedding_model and not self.embedding_model):
+                self.dimension = int(vectors.shape[1])
+                self.embedding_model = self.embedding_model or embedding_model
+                self._full_precision = self._keeps_full_precision
+                self._write_info()
+
+            # Vectors are written first so every record always has its row
+            self._write_vectors(vectors[keep])
+
+            with open(self._path(RECORDS_FILE), "ab") as records_file:
+                for index in keep:
+                    record = {"id": ids[index], "text": texts[index], "metadata": metadatas[index]}
+                    records_file.write((json.dumps(record, default=str) + "\n").encode("utf-8"))
+                    self._append_record(ids[index], texts[index], metadatas[index])
+                self._records_offset = records_file.tell()
+
+            self._stamp = self._records_stamp()
+            self._map_matrix()
+
+        return [ids[index] for index in keep]
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[Dict[str, Any]]]=None,
+        *,
+        ids: Optional[List[str]]=None,
+        **kwargs: Any
+    ) -> List[str]:
+        """Embed and add texts to the collection"""
+        texts = list(texts)
+        if not texts:
+            return []
+
+        embeddings = self.embedding_function.embed_documents(texts)
+        return self.add_embeddings(texts, embeddings, metadatas=metadatas, ids=ids)
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        """Get the documents stored under the given IDs"""
+        self._sync()
+        with self._lock:
+            return [self._document(self._rows[id_]) for id_ in ids if id_ in self._rows]
+
+    def get_ids(self, filter: Optional[Dict[str, Any]]=None) -> List[str]:
+        """Get the IDs of the documents matching a metadata filter"""
+        self._sync()
+        with self._lock:
+            rows = self._filter_rows(filter)
+            if rows is None:
+                return list(self._ids)
+            return [self._ids[row] for row in rows]
+
+    def delete(self, ids: Optional[List[str]]=None, **kwargs: Any) -> Optional[bool]:
+        """Delete documents by ID and rewrite the collection without them"""
+        if not ids:
+            return False
+
+        with self._lock, self._file_lock:
+            self._sync()
+            doomed = {self._rows[id_] for id_ in ids if id_ in self._rows}
+            if not doomed:
+                return False
+
+            keep = [row for row in range(len(self._ids)) if row not in doomed]
+            vectors = self._vectors(np.asarray(keep, dtype=np.int64)) if self._matrix is not None else None
+            records = [(self._ids[row], self._texts[row], self._metadatas[row]) for row in keep]
+
+            self._ids, self._texts, self._metadatas = [], [], []
+            self._rows, self._source_rows = {}, {}
+            for record in records:
+                self._append_record(*record)
+
+            # Release the maps before the files are replaced
+            self._matrix = self._scales = self._full = None
+            self._rewrite(vectors)
+
+        return True
+
+    def _rewrite(self, vectors: Optional[np.ndarray]) -> None:
+        """Atomically rewrite the vector and record files from memory"""
+        if vectors is None:
+            vectors = np.zeros((0, self.dimension or 0), dtype=np.float32)
+        self._write_vectors(vectors, suffix=".tmp", mode="wb")
+
+        with open(self._path(RECORDS_FILE + ".tmp"), "wb") as records_file:
+            for id_, text, metadata in zip(self._ids, self._texts, self._metadatas):
+                record = {"id": id_, "text": text, "metadata": metadata}
+                records_file.write((json.dumps(record, default=str) + "\n").encode("utf-8"))
+            self._records_offset = records_file.tell()
+
+        for file_name in self._matrix_files():
+            os.replace(self._path(file_name + ".tmp"), self._path(file_name))
+        os.replace(self._path(RECORDS_FILE + ".tmp"), self._path(RECORDS_FILE))
+
+        # Tells other processes to reload instead of reading on from their old offset
+        self._generation += 1
+        if self.dimension is not None:
+            self._write_info()
+        self._stamp = self._records_stamp()
+        self._map_matrix()
+
+    def _document(self, row: int) -> Document:
+        """Build the Document stored in a row"""
+        return Document(id=self._ids[row], page_content=self._texts[row], metadata=dict(self._metadatas[row]))
+
+    @staticmethod
+    def _matches(metadata: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+        """Check metadata against a Chroma-style filter of equality, "$eq", "$ne" and "$in" conditions"""
+        for key, condition in filter.items():
+            value = metadata.get(key)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for operator, operand in condition.items():
+                if operator == "$eq" and value != operand:
+                    return False
+                elif operator == "$ne" and value == operand:
+                    return False
+                elif operator == "$in" and value not in operand:
+                    return False
+                elif operator not in ("$eq", "$ne", "$in"):
+                    raise ValueError(f"Unsupported filter operator: {operator}")
+        return True
+
+    def _filter_rows(self, filter: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Get the rows matching a metadata filter, or None when every row matches"""
+        if not filter:
+            return None
+
+        with self._lock:
+            condition = filter.get(SOURCE_ID_KEY)
+            if len(filter) == 1 and condition is not None:
+                # Scoped to sources: use the row index instead of scanning the metadata
+                if isinstance(condition, dict) and set(condition) == {"$in"}:
+                    source_ids = condition["$in"]
+                elif not isinstance(condition, dict):
+                    source_ids = [condition]
+                else:
+                    source_ids = None
+
+                if source_ids is not None:
+                    rows = [row for source_id in source_ids for row in self._source_rows.get(source_id, [])]
+                    return np.asarray(sorted(rows), dtype=np.int64)
+
+            return np.asarray(
+                [row for row, metadata in enumerate(self._metadatas) if self._matches(metadata, filter)],
+                dtype=np.int64
+            )
+
+    def _scores(self, query: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Score rows of the searched matrix against a normalized query"""
+        matrix = self._matrix
+        if self.dtype == "float32":
+            return (matrix if rows is None else matrix[rows]) @ query
+
+        # Dequantize block by block so the float32 copy never covers the whole matrix
+        count = matrix.shape[0] if rows is None else len(rows)
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, SCORE_BLOCK_ROWS):
+            block_rows = slice(start, start + SCORE_BLOCK_ROWS) if rows is None else rows[start:start + SCORE_BLOCK_ROWS]
+            block_scores = matrix[block_rows].astype(np.float32) @ query
+            if self.dtype == "int8":
+                block_scores *= self._scales[block_rows]
+            scores[start:start + SCORE_BLOCK_ROWS] = block_scores
+        return scores
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Get the positions of the k highest scores, best first"""
+        k = min(k, scores.shape[0])
+        if k < scores.shape[0]:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(scores.shape[0])
+        return top[np.argsort(-scores[top])]
+
+    def _search(self, query: np.ndarray, k: int, rows: Optional[np.ndarray]=None) -> List[Tuple[int, float]]:
+        """Find the k rows (out of `rows`, or all of them) with the highest cosine similarity to a normalized query"""
+        with self._lock:
+            if self._matrix is None or k <= 0 or (rows is not None and not len(rows)):
+                return []
+            scores = self._scores(query, rows)
+            rescoring = self.rescore and self.dtype != "float32"
+
+            top = self._top_k(scores, k * self.rescore_factor if rescoring else k)
+            candidates = top if rows is None else rows[top]
+            if not rescoring:
+                return [(int(row), float(score)) for row, score in zip(candidates, scores[top])]
+
+            # Rescore the candidates with the full precision vectors
+            order = np.sort(candidates)
+            exact = np.asarray(self._full[order]) @ query
+            best = self._top_k(exact, k)
+            return [(int(order[position]), float(exact[position])) for position in best]
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int=4,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """Get the k most similar documents to an embedding with their cosine similarity"""
+        self._sync()
+        if self.dimension and len(embedding) != self.dimension:
+            raise ValueError(f"Query dimension {len(embedding)} does not match collection dimension {self.dimension}")
+        query = self._normalize(np.asarray([embedding], dtype=np.float32))[0]
+        rows = self._filter_rows(kwargs.get("filter"))
+        return [(self._document(row), score) for row, score in self._search(query, k, rows)]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int=4, **kwargs: Any) -> List[Document]:
+        """Get the k most similar documents to an embedding"""
+        return [document for document, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search_with_score(self, query: str, k: int=4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        """Get the k most similar documents to a query with their cosine similarity"""
+        return self.similarity_search_with_score_by_vector(self.embedding_function.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query: str, k: int=4, **kwargs: Any) -> List[Document]:
+        """Get the k most similar documents to a query"""
+        return [document for document, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        """Map cosine similarity onto a [0, 1] relevance score"""
+        # Quantized scores can stray slightly outside [-1, 1]
+        return lambda score: min(max((score + 1.0) / 2.0, 0.0), 1.0)
+
+    def bind(self, embedding_function: Embeddings, embedding_model: Optional[str]=None) -> "NumpyStoreView":
+        """
+        Get a view of the collection that embeds texts and queries with its own model
+
+        Args:
+            embedding_function (Embeddings): The embedding model used for texts and queries.
+            embedding_model (Optional[str]): Identifies the embedding model. Must match the model
+                the collection's vectors come from, if any were added yet.
+
+        Returns:
+            NumpyStoreView: The view of the collection.
+        """
+        with self._lock:
+            self._check_embedding_model(embedding_model)
+        return NumpyStoreView(self, embedding_function, embedding_model)
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[Dict[str, Any]]]=None,
+        *,
+        ids: Optional[List[str]]=None,
+        collection_name: str="collection",
+        persist_directory: str="data/numpy_store",
+        **kwargs: Any
+    ) -> "NumpyVectorStore":
+        """Create a collection from a list of texts"""
+        store = cls(collection_name=collection_name, embedding_function=embedding, persist_directory=persist_directory)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+class NumpyStoreView(BaseVectorStore):
+    def __init__(self, collection: NumpyVectorStore, embedding_function: Embeddings, embedding_model: Optional[str]=None):
+        """
+        Initialize the NumpyStoreView.
+
+        A collection is opened once per process so its files have a single writer.
+        Every client reaches it through its own view, which embeds texts and queries
+        with that client's model and credentials.
+
+        Args:
+            collection (NumpyVectorStore): The shared open collection (a NumpyVectorStore or HNSWVectorStore).
+            embedding_function (Embeddings): The embedding model used for texts and queries.
+            embedding_model (Optional[str]): Identifies the embedding model, recorded with the vectors it adds.
+        """
+        self.collection = collection
+        self.embedding_function = embedding_function
+        self.embedding_model = embedding_model
+
+    def __getattr__(self, name: str) -> Any:
+        # Everything that does not embed is read from the shared collection (count, get_ids, persist...)
+        if name == "collection":
+            raise AttributeError(name)
+        return getattr(self.collection, name)
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding_function
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]]=None,
+        ids: Optional[List[str]]=None
+    ) -> List[str]:
+        """Add texts with precomputed embeddings to the collection"""
+        return self.collection.add_embeddings(
+            texts,
+            embeddings,
+            metadatas=metadatas,
+            ids=ids,
+            embedding_model=self.embedding_model
+        )
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[Dict[str, Any]]]=None,
+        *,
+        ids: Optional[List[str]]=None,
+        **kwargs: Any
+    ) -> List[str]:
+        """Embed and add texts to the collection"""
+        texts = list(texts)
+        if not texts:
+            return []
+
+        embeddings = self.embedding_function.embed_documents(texts)
+        return self.add_embeddings(texts, embeddings, metadatas=metadatas, ids=ids)
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        """Get the documents stored under the given IDs"""
+        return self.collection.get_by_ids(ids)
+
+    def delete(self, ids: Optional[List[str]]=None, **kwargs: Any) -> Optional[bool]:
+        """Delete documents by ID"""
+        return self.collection.delete(ids, **kwargs)
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int=4,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        """Get the k most similar documents to an embedding with their cosine similarity"""
+        return self.collection.similarity_search_with_score_by_vector(embedding, k, **kwargs)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int=4, **kwargs: Any) -> List[Document]:
+        """Get the k most similar documents to an embedding"""
+        return self.collection.similarity_search_by_vector(embedding, k, **kwargs)
+
+    def similarity_search_with_score(self, query: str, k: int=4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        """Get the k most similar documents to a query with their cosine similarity"""
+        return self.similarity_search_with_score_by_vector(self.embedding_function.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query: str, k: int=4, **kwargs: Any) -> List[Document]:
+        """Get the k most similar documents to a query"""
+        return [document for document, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        return self.collection._select_relevance_score_fn()
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[Dict[str, Any]]]=None,
+        **kwargs: Any
+    ) -> "NumpyStoreView":
+        """Create a collection from a list of texts"""
+        return NumpyVectorStore.from_texts(texts, embedding, metadatas, **kwargs).bind(embedding)
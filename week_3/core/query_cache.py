@@ -0,0 +1,148 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+class QueryCache:
+    def __init__(self, max_embeddings: int=4096, max_results: int=4096):
+        """
+        Initialize the QueryCache.
+
+        Two in-memory LRU caches for follow-up questions: query embeddings, and the
+        IDs of the chunks a retriever returned. Results are stored under the version
+        of their collection, which `bump` increments whenever the collection changes,
+        so stale entries are never served and simply age out.
+
+        Args:
+            max_embeddings (int): The maximum number of query embeddings to keep.
+            max_results (int): The maximum number of retrieval results to keep.
+        """
+        self.max_embeddings = max_embeddings
+        self.max_results = max_results
+        self.__lock = threading.Lock()
+        self.__embeddings: "OrderedDict[Hashable, List[float]]" = OrderedDict()
+        self.__results: "OrderedDict[Hashable, List[str]]" = OrderedDict()
+        self.__versions: Dict[Hashable, int] = {}
+        self.__counters = {"embedding_hits": 0, "embedding_misses": 0, "result_hits": 0, "result_misses": 0}
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Normalize a query so repeats differing only in case, spacing or end punctuation match"""
+        return re.sub(r"\s+", " ", query).strip().rstrip("?!.").strip().lower()
+
+    def __get(self, entries: OrderedDict, key: Hashable, counter: str) -> Optional[Any]:
+        """Look up an LRU entry and count the hit or miss"""
+        with self.__lock:
+            value = entries.get(key)
+            if value is None:
+                self.__counters[counter + "_misses"] += 1
+                return None
+            entries.move_to_end(key)
+            self.__counters[counter + "_hits"] += 1
+            return value
+
+    def __put(self, entries: OrderedDict, key: Hashable, value: Any, max_entries: int) -> None:
+        """Store an LRU entry, evicting the least recently used ones beyond `max_entries`"""
+        with self.__lock:
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+
+    def get_embedding(self, model_key: Hashable, query: str) -> Optional[List[float]]:
+        """Look up the embedding of a query for an embedding model"""
+        return self.__get(self.__embeddings, (model_key, self.normalize(query)), "embedding")
+
+    def put_embedding(self, model_key: Hashable, query: str, embedding: List[float]) -> None:
+        """Store the embedding of a query for an embedding model"""
+        self.__put(self.__embeddings, (model_key, self.normalize(query)), embedding, self.max_embeddings)
+
+    def version(self, collection_key: Hashable) -> int:
+        """Get the current version of a collection"""
+        with self.__lock:
+            return self.__versions.get(collection_key, 0)
+
+    def bump(self, collection_key: Hashable) -> None:
+        """Invalidate the cached results of a collection after it changed"""
+        with self.__lock:
+            self.__versions[collection_key] = self.__versions.get(collection_key, 0) + 1
+
+    def results_key(self, collection_key: Hashable, search_key: Hashable, query: str) -> Hashable:
+        """
+        Build the cache key of a search, under the current version of its collection
+
+        Args:
+            collection_key (Hashable): Identifies the collection searched.
+            search_key (Hashable): Identifies the kind of search and its parameters.
+            query (str): The query text.
+
+        Returns:
+            Hashable: The key to look up and store the results with.
+        """
+        return (collection_key, self.version(collection_key), search_key, self.normalize(query))
+
+    def get_results(self, key: Hashable) -> Optional[List[str]]:
+        """Look up the chunk IDs a search returned, best first"""
+        return self.__get(self.__results, key, "result")
+
+    def put_results(self, key: Hashable, ids: List[str]) -> None:
+        """Store the chunk IDs a search returned"""
+        self.__put(self.__results, key, list(ids), self.max_results)
+
+    def stats(self) -> Dict[str, float]:
+        """Get the cache sizes, hit/miss counters and hit rates"""
+        with self.__lock:
+            stats = {"embeddings": len(self.__embeddings), "results": len(self.__results), **self.__counters}
+
+        for kind in ("embedding", "result"):
+            lookups = stats[f"{kind}_hits"] + stats[f"{kind}_misses"]
+            stats[f"{kind}_hit_rate"] = stats[f"{kind}_hits"] / lookups if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Forget every cached entry and counter"""
+        with self.__lock:
+            self.__embeddings.clear()
+            self.__results.clear()
+            for counter in self.__counters:
+                self.__counters[counter] = 0
+
+class CachedRetriever(BaseRetriever):
+    """
+    Serves repeated queries from the QueryCache.
+
+    Only the IDs of the retrieved chunks are cached; on a hit the chunks are read
+    back from the store by ID, so no query is embedded and no search runs.
+    """
+
+    retriever: BaseRetriever
+    store: Any
+    cache: Any
+    collection_key: Any
+    search_key: Any
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        # Taken before searching, so results racing with an ingest are filed under the old version
+        key = self.cache.results_key(self.collection_key, self.search_key, query)
+        ids = self.cache.get_results(key)
+        if ids is not None:
+            documents = {document.id: document for document in self.store.get_by_ids(ids)}
+            if len(documents) == len(ids):
+                return [documents[id] for id in ids]
+
+        documents = self.retriever.invoke(query, config={"callbacks": run_manager.get_child()})
+        if all(document.id for document in documents):
+            self.cache.put_results(key, [document.id for document in documents])
+
+        return documents
+
+query_cache = QueryCache()
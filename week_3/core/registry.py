@@ -0,0 +1,78 @@
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+import chromadb
+from chromadb.api import ClientAPI
+from chromadb.config import Settings
+from langchain_core.vectorstores import VectorStore as BaseVectorStore
+
+class StoreRegistry:
+    """Process-wide cache of Chroma clients and open store handles."""
+
+    def __init__(self, max_recent: int=8):
+        """
+        Initialize the StoreRegistry.
+
+        Store handles are shared while any VectorStore uses them, and the `max_recent` most
+        recently requested ones are also kept when unused, so re-initializing is instant.
+        Older unused handles are dropped, releasing their embedding model and credentials.
+
+        Args:
+            max_recent (int): The number of recently used store handles kept alive.
+        """
+        self.max_recent = max_recent
+        self.__lock = threading.RLock()
+        self.__clients: Dict[str, ClientAPI] = {}
+        self.__stores: "weakref.WeakValueDictionary[Hashable, BaseVectorStore]" = weakref.WeakValueDictionary()
+        self.__recent: "OrderedDict[Hashable, BaseVectorStore]" = OrderedDict()
+
+    def get_client(self, persist_directory: str) -> ClientAPI:
+        """
+        Get the shared persistent Chroma client for a directory
+
+        Args:
+            persist_directory (str): The directory the client persists to.
+
+        Returns:
+            ClientAPI: The Chroma client.
+        """
+        with self.__lock:
+            if persist_directory not in self.__clients:
+                self.__clients[persist_directory] = chromadb.PersistentClient(
+                    path=persist_directory,
+                    settings=Settings(anonymized_telemetry=False)
+                )
+            return self.__clients[persist_directory]
+
+    def get_store(self, key: Hashable, factory: Callable[[], BaseVectorStore]) -> BaseVectorStore:
+        """
+        Get the shared store handle for a key, opening it on first use
+
+        Args:
+            key (Hashable): Identifies the collection (and, for Chroma, the embedding model and key it was opened with).
+            factory (Callable[[], BaseVectorStore]): Opens the store when it is not cached yet.
+
+        Returns:
+            BaseVectorStore: The store handle.
+        """
+        with self.__lock:
+            store = self.__stores.get(key)
+            if store is None:
+                store = self.__stores[key] = factory()
+
+            self.__recent[key] = store
+            self.__recent.move_to_end(key)
+            while len(self.__recent) > self.max_recent:
+                self.__recent.popitem(last=False)
+            return store
+
+    def clear(self) -> None:
+        """Forget every cached client and store handle"""
+        with self.__lock:
+            self.__recent.clear()
+            self.__stores.clear()
+            self.__clients.clear()
+
+store_registry = StoreRegistry()
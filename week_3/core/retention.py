@@ -0,0 +1,254 @@
+"""
+Compact vector store collections, deleting sources that outlived their retention policy.
+
+Run from the week_3 directory, e.g.:
+
+    python -m core.retention --collection news-store --ttl-days 30 --max-chunks 100000
+
+It is safe to run next to the app for the "numpy" and "hnsw" backends: their collections
+and the lexical index take a lock file to write, and a running app reloads them once it
+sees they were rewritten. Chroma does not support two processes writing one directory,
+so Chroma collections (the default backend) are only compacted with the app stopped,
+which the command asks to confirm with --app-stopped:
+
+    python -m core.retention --backend chroma --collection news-store --ttl-days 30 --app-stopped
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Hashable, List, Optional
+
+RETENTION_LOG_PATH = "data/retention.sqlite"
+
+@dataclass
+class RetentionPolicy:
+    """How long sources are kept and how many chunks a collection may hold"""
+    ttl: Optional[float]=None
+    max_chunks: Optional[int]=None
+
+@dataclass
+class CompactionReport:
+    """
+    The outcome of compacting one collection.
+
+    `bytes_scope` tells what the byte counts cover: "collection" (its own files and
+    lexical index) or "directory" (Chroma, whose collections share one SQLite file,
+    so the counts include every collection of the persist directory).
+    """
+    collection: str
+    sources_removed: List[str]=field(default_factory=list)
+    chunks_removed: int=0
+    bytes_before: int=0
+    bytes_after: int=0
+    bytes_scope: str="collection"
+    seconds: float=0.0
+
+    @property
+    def bytes_freed(self) -> int:
+        return max(self.bytes_before - self.bytes_after, 0)
+
+def disk_usage(*paths: str) -> int:
+    """Get the total size in bytes of files and directory trees"""
+    total = 0
+    for path in paths:
+        if os.path.isfile(path):
+            total += os.path.getsize(path)
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    # Removed while walking
+                    pass
+    return total
+
+class RetentionLog:
+    def __init__(self, path: str=RETENTION_LOG_PATH):
+        """
+        Initialize the RetentionLog.
+
+        Records, per collection, each source's chunk count and when it was last
+        ingested or asked about, in a SQLite file.
+
+        Args:
+            path (str): The path of the SQLite file backing the log.
+        """
+        self.path = path
+        self.__lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sources (
+                collection TEXT NOT NULL,
+                source_id TEXT NOT NULL,
+                chunks INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (collection, source_id)
+            )
+            """
+        )
+        self.__connection.commit()
+
+    @staticmethod
+    def collection(collection_key: Hashable) -> str:
+        """Turn a collection key into the text stored in the log"""
+        if isinstance(collection_key, tuple):
+            return "|".join(str(part) for part in collection_key)
+        return str(collection_key)
+
+    def record(self, collection_key: Hashable, chunks: Dict[str, int]) -> None:
+        """
+        Record ingested sources and mark them as accessed
+
+        Args:
+            collection_key (Hashable): Identifies the collection.
+            chunks (Dict[str, int]): The number of chunks of each ingested source, keyed by source ID.
+        """
+        if not chunks:
+            return
+
+        now = time.time()
+        with self.__lock:
+            self.__connection.executemany(
+                "INSERT INTO sources (collection, source_id, chunks, last_access) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (collection, source_id) DO UPDATE SET "
+                "chunks = MAX(chunks, excluded.chunks), last_access = excluded.last_access",
+                [(self.collection(collection_key), source_id, count, now) for source_id, count in chunks.items()]
+            )
+            self.__connection.commit()
+
+    def touch(self, collection_key: Hashable, source_ids: List[str]) -> None:
+        """Mark sources of a collection as accessed"""
+        if not source_ids:
+            return
+
+        now = time.time()
+        with self.__lock:
+            self.__connection.executemany(
+                "UPDATE sources SET last_access = ? WHERE collection = ? AND source_id = ?",
+                [(now, self.collection(collection_key), source_id) for source_id in source_ids]
+            )
+            self.__connection.commit()
+
+    def expired(self, collection_key: Hashable, policy: RetentionPolicy, now: Optional[float]=None) -> List[str]:
+        """
+        Select the sources a policy evicts: those not accessed within the TTL, then the
+        least recently accessed ones until the collection fits in `max_chunks`
+
+        Args:
+            collection_key (Hashable): Identifies the collection.
+            policy (RetentionPolicy): The retention policy of the collection.
+            now (Optional[float]): The current time. Defaults to the time of the call.
+
+        Returns:
+            List[str]: The IDs of the sources to delete.
+        """
+        now = time.time() if now is None else now
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT source_id, chunks, last_access FROM sources WHERE collection = ? ORDER BY last_access",
+                (self.collection(collection_key),)
+            ).fetchall()
+
+        expired = []
+        remaining = sum(chunks for _, chunks, _ in rows)
+        for source_id, chunks, last_access in rows:
+            outlived = policy.ttl is not None and now - last_access > policy.ttl
+            oversized = policy.max_chunks is not None and remaining > policy.max_chunks
+            if not (outlived or oversized):
+                break
+            expired.append(source_id)
+            remaining -= chunks
+        return expired
+
+    def forget(self, collection_key: Hashable, source_ids: List[str]) -> None:
+        """Remove deleted sources from the log"""
+        with self.__lock:
+            self.__connection.executemany(
+                "DELETE FROM sources WHERE collection = ? AND source_id = ?",
+                [(self.collection(collection_key), source_id) for source_id in source_ids]
+            )
+            self.__connection.commit()
+
+_logs: Dict[str, RetentionLog] = {}
+_logs_lock = threading.Lock()
+
+def get_retention_log(path: str=RETENTION_LOG_PATH) -> RetentionLog:
+    """Get the process-wide retention log stored at `path`"""
+    with _logs_lock:
+        if path not in _logs:
+            _logs[path] = RetentionLog(path)
+        return _logs[path]
+
+def main() -> None:
+    # Imported here since the store itself records into the retention log
+    from core.numpy_store import SUPPORTED_VECTOR_DTYPES
+    from core.storage import SUPPORTED_VECTOR_BACKENDS, VectorStore
+    from utils.model_util import (
+        SUPPORTED_EMBEDDING_PROVIDERS,
+        SUPPORTED_HUGGINGFACE_EMBEDDING_MODELS,
+        SUPPORTED_OPENAI_EMBEDDING_MODELS
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--collection", action="append", required=True,
+                        help="Collection to compact, e.g. news-store (repeatable)")
+    parser.add_argument("--embedding-provider", default=SUPPORTED_EMBEDDING_PROVIDERS[0],
+                        choices=SUPPORTED_EMBEDDING_PROVIDERS)
+    parser.add_argument("--embedding-model", choices=SUPPORTED_OPENAI_EMBEDDING_MODELS + SUPPORTED_HUGGINGFACE_EMBEDDING_MODELS,
+                        help="Embedding model of the collection. Defaults to the provider's first model")
+    parser.add_argument("--embedding-dimensions", type=int, help="Size of shortened text-embedding-3 vectors, if used")
+    parser.add_argument("--backend", default=SUPPORTED_VECTOR_BACKENDS[0], choices=SUPPORTED_VECTOR_BACKENDS)
+    parser.add_argument("--vector-dtype", default=SUPPORTED_VECTOR_DTYPES[0], choices=SUPPORTED_VECTOR_DTYPES)
+    parser.add_argument("--ttl-days", type=float, help="Delete sources not accessed for this many days")
+    parser.add_argument("--max-chunks", type=int, help="Delete the least recently accessed sources beyond this many chunks")
+    parser.add_argument("--interval", type=float, help="Keep running, compacting every this many seconds")
+    parser.add_argument("--app-stopped", action="store_true",
+                        help="Confirm that no app has the Chroma directory open; required for the chroma backend")
+    args = parser.parse_args()
+
+    if args.ttl_days is None and args.max_chunks is None:
+        parser.error("give --ttl-days, --max-chunks or both")
+    if args.backend == "chroma" and not args.app_stopped:
+        parser.error("Chroma collections cannot be compacted while the app runs: stop it, then pass --app-stopped")
+
+    policy = RetentionPolicy(
+        ttl=args.ttl_days * 24 * 3600 if args.ttl_days is not None else None,
+        max_chunks=args.max_chunks
+    )
+    if args.embedding_model is None:
+        args.embedding_model = (
+            SUPPORTED_HUGGINGFACE_EMBEDDING_MODELS[0]
+            if args.embedding_provider == SUPPORTED_EMBEDDING_PROVIDERS[1]
+            else SUPPORTED_OPENAI_EMBEDDING_MODELS[0]
+        )
+
+    # Compaction only deletes, so the stores never build an embedding model or need an API key
+    stores = [
+        VectorStore(
+            collection_name=collection,
+            embedding_provider=args.embedding_provider,
+            embedding_model_name=args.embedding_model,
+            embedding_dimensions=args.embedding_dimensions,
+            backend=args.backend,
+            vector_dtype=args.vector_dtype
+        )
+        for collection in args.collection
+    ]
+
+    while True:
+        for store in stores:
+            report = store.compact(policy)
+            print(json.dumps({**asdict(report), "bytes_freed": report.bytes_freed}))
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+if __name__ == "__main__":
+    main()
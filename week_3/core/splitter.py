@@ -0,0 +1,169 @@
+from typing import Any, List, Optional, Union
+
+import numpy as np
+import tiktoken
+from langchain_text_splitters import TextSplitter
+
+DEFAULT_SEPARATORS = ["\n\n", "\n", " ", ""]
+
+SUPPORTED_TEXT_SPLITTERS = [
+        "recursive",
+        "fast",
+]
+
+class FastTextSplitter(TextSplitter):
+    def __init__(
+        self,
+        chunk_size: int=1024,
+        chunk_overlap: int=200,
+        separators: Optional[List[str]]=None,
+        encoding: Union[str, tiktoken.Encoding, None]=None,
+        **kwargs: Any
+    ):
+        """
+        Initialize the FastTextSplitter.
+
+        Splits like RecursiveCharacterTextSplitter: a chunk ends at the last paragraph
+        break that keeps it within `chunk_size`, else the last line break, else the
+        last space, else mid-word, and the next chunk starts up to `chunk_overlap`
+        before it on a separator of the same kind. Instead of recursing over substrings, every
+        separator offset is found in one vectorized scan and each cut is a binary
+        search. Lengths are measured in characters, or in tokens when an encoding is
+        given, with the text tokenized once.
+
+        On single-line text (e.g. transcripts) the chunks match RecursiveCharacterTextSplitter's.
+        On text with line or paragraph breaks the boundaries differ, since the recursive splitter
+        merges the pieces of each separator level separately, so switching splitters there changes
+        chunk content and with it the content hashes used for dedup.
+
+        Args:
+            chunk_size (int): The maximum length of a chunk.
+            chunk_overlap (int): The maximum length shared by consecutive chunks.
+            separators (Optional[List[str]]): The literal separators to cut at, in order of preference.
+                An empty string allows cutting anywhere. Defaults to paragraphs, lines, spaces, anywhere.
+            encoding (Union[str, tiktoken.Encoding, None]): The tiktoken encoding (or its name, e.g. "cl100k_base")
+                to measure lengths in tokens with. Defaults to measuring characters.
+            **kwargs: Additional keyword arguments for TextSplitter (e.g. add_start_index).
+        """
+        if isinstance(encoding, str):
+            encoding = tiktoken.get_encoding(encoding)
+
+        if encoding is None:
+            length_function = len
+        else:
+            length_function = lambda text: len(encoding.encode_ordinary(text))
+
+        super().__init__(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=length_function,
+            **kwargs
+        )
+        self.separators = DEFAULT_SEPARATORS if separators is None else separators
+        self.encoding = encoding
+
+    @staticmethod
+    def _find_all(codepoints: np.ndarray, separator: str) -> np.ndarray:
+        """Get the start offset of every occurrence of a separator in a text given as code points"""
+        pattern = np.frombuffer(separator.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        count = codepoints.shape[0] - pattern.shape[0] + 1
+        if count <= 0:
+            return np.zeros(0, dtype=np.int64)
+
+        mask = codepoints[:count] == pattern[0]
+        for offset in range(1, pattern.shape[0]):
+            mask &= codepoints[offset:offset + count] == pattern[offset]
+        return np.flatnonzero(mask)
+
+    def _unit_starts(self, text: str, codepoints: np.ndarray) -> Optional[np.ndarray]:
+        """Get the character offset where each token starts, or None when measuring characters"""
+        if self.encoding is None:
+            return None
+
+        tokens = self.encoding.encode_ordinary(text)
+        token_bytes = np.fromiter(
+            (len(piece) for piece in self.encoding.decode_tokens_bytes(tokens)),
+            dtype=np.int64,
+            count=len(tokens)
+        )
+        token_byte_starts = np.concatenate(([0], np.cumsum(token_bytes)[:-1])) if len(tokens) else token_bytes
+
+        # UTF-8 width of every character, to map token byte offsets onto characters
+        widths = 1 + (codepoints >= 0x80) + (codepoints >= 0x800) + (codepoints >= 0x10000)
+        char_byte_starts = np.concatenate(([0], np.cumsum(widths)[:-1]))
+        return np.searchsorted(char_byte_starts, token_byte_starts, side="right") - 1
+
+    def split_text(self, text: str) -> List[str]:
+        """
+        Split a text into chunks
+
+        Args:
+            text (str): The text to split.
+
+        Returns:
+            List[str]: The chunks, stripped of surrounding whitespace unless disabled.
+        """
+        if not text:
+            return []
+
+        codepoints = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        breaks = [self._find_all(codepoints, separator) for separator in self.separators if separator]
+        hard_cuts = "" in self.separators or not breaks
+
+        unit_starts = self._unit_starts(text, codepoints)
+        length = len(text)
+        units = length if unit_starts is None else len(unit_starts)
+
+        def units_before(position: int) -> int:
+            return position if unit_starts is None else int(unit_starts.searchsorted(position, side="left"))
+
+        def unit_position(unit: int) -> int:
+            if unit >= units:
+                return length
+            return unit if unit_starts is None else int(unit_starts[unit])
+
+        chunks = []
+        start = 0
+        while start < length:
+            limit = unit_position(units_before(start) + self._chunk_size)
+            end, level = length, None
+            if limit < length:
+                end = None
+                for level, positions in enumerate(breaks):
+                    index = int(positions.searchsorted(limit, side="right")) - 1
+                    if index >= 0 and positions[index] > start:
+                        end = int(positions[index])
+                        break
+                else:
+                    level = None
+
+                if end is None and hard_cuts:
+                    end = max(limit, start + 1)
+                elif end is None:
+                    # Nothing fits and cutting mid-word is not allowed: cut at the next separator
+                    end = length
+                    for positions in breaks:
+                        index = int(positions.searchsorted(start, side="right"))
+                        if index < len(positions):
+                            end = min(end, int(positions[index]))
+
+            chunk = text[start:end].strip() if self._strip_whitespace else text[start:end]
+            if chunk:
+                chunks.append(chunk)
+            if end >= length:
+                break
+
+            next_start = end
+            if self._chunk_overlap > 0:
+                # Like the recursive splitter, overlap whole pieces of the level the chunk was cut at
+                low = unit_position(max(units_before(end) - self._chunk_overlap, 0))
+                if level is None:
+                    next_start = max(low, start + 1) if hard_cuts else end
+                else:
+                    positions = breaks[level]
+                    index = int(positions.searchsorted(low, side="left"))
+                    if index < len(positions) and start < positions[index] < end:
+                        next_start = int(positions[index])
+            start = next_start
+
+        return chunks
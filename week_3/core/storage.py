@@ -1,26 +1,73 @@
+import asyncio
+import hashlib
 import os
-from typing import List, Optional
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
 
 from langchain_chroma import Chroma
 from langchain_community.document_loaders import (
     PyPDFLoader,
     TextLoader,
     UnstructuredMarkdownLoader,
-    YoutubeLoader,
 )
+from langchain_community.document_loaders.base import BaseLoader
 from langchain_community.vectorstores.utils import filter_complex_metadata
 from langchain_core.documents import Document
-from langchain_core.vectorstores.base import VectorStoreRetriever
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores.base import VectorStore as BaseVectorStore, VectorStoreRetriever
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from core.embeddings import EmbeddingClient
+from core.hnsw_store import HNSWVectorStore
+from core.lexical import BM25Index, HybridRetriever, LexicalRetriever
+from core.numpy_store import SOURCE_ID_KEY, SUPPORTED_VECTOR_DTYPES, NumpyStoreView, NumpyVectorStore
+from core.query_cache import CachedRetriever, query_cache
+from core.registry import store_registry
+from core.retention import CompactionReport, RetentionPolicy, disk_usage, get_retention_log
+from core.splitter import SUPPORTED_TEXT_SPLITTERS, FastTextSplitter
 from summarizer.news_summarizer.articleloader import ArticleLoader
+from summarizer.pdf_summarizer.pdfloader import CONTENT_HASH_KEY, InMemoryPDFLoader, ParallelPDFLoader
+from summarizer.youtube_summarizer.transcriptloader import TranscriptLoader
 from utils.model_util import (
     SUPPORTED_EMBEDDING_PROVIDERS,
+    SUPPORTED_HUGGINGFACE_BACKENDS,
     SUPPORTED_OPENAI_EMBEDDING_MODELS
 )
 
 PERSIST_DIRECTORY = "data/chroma_db"
+NUMPY_PERSIST_DIRECTORY = "data/numpy_store"
+LEXICAL_INDEX_DIRECTORY = "data/lexical_index"
+
+SUPPORTED_VECTOR_BACKENDS = [
+        "chroma",
+        "numpy",
+        "hnsw",
+]
+
+SUPPORTED_RETRIEVAL_MODES = [
+        "vector",
+        "hybrid",
+        "lexical",
+]
+
+# Chroma names for the HNSW parameters accepted by `index_params`
+CHROMA_HNSW_PARAMS = {
+    "M": "hnsw:M",
+    "ef_construction": "hnsw:construction_ef",
+    "ef_search": "hnsw:search_ef",
+}
+
+@dataclass
+class IngestStats:
+    """Outcome of the last ingest into the vector store."""
+    added: int=0
+    reused: int=0
+    source_chunks: Dict[str, int]=field(default_factory=dict)
 
 class VectorStore:
     def __init__(
@@ -30,7 +77,20 @@ class VectorStore:
         embedding_model_name: str=SUPPORTED_OPENAI_EMBEDDING_MODELS[0],
         embedding_api_key: Optional[str]=None,
         chunk_size: int=1024,
-        chunk_overlap: int=200
+        chunk_overlap: int=200,
+        embedding_batch_size: int=256,
+        embedding_max_workers: int=4,
+        max_concurrency: int=4,
+        ingest_batch_size: Optional[int]=None,
+        pdf_workers: int=1,
+        backend: str=SUPPORTED_VECTOR_BACKENDS[0],
+        index_params: Optional[Dict[str, int]]=None,
+        vector_dtype: str=SUPPORTED_VECTOR_DTYPES[0],
+        rescore: Optional[bool]=None,
+        embedding_backend: str=SUPPORTED_HUGGINGFACE_BACKENDS[0],
+        embedding_dimensions: Optional[int]=None,
+        splitter: str=SUPPORTED_TEXT_SPLITTERS[0],
+        chunk_encoding: Optional[str]=None
     ):
         """
         Initialize the VectorStore.
@@ -42,59 +102,279 @@ class VectorStore:
             embedding_api_key (Optional[str]): The API key to use for the embedding model.
             chunk_size (int): The size of the chunks to split the documents into.
             chunk_overlap (int): The overlap between the chunks.
+            embedding_batch_size (int): The number of chunks embedded per request or encoding pass.
+            embedding_max_workers (int): The number of embedding batches processed in parallel.
+            max_concurrency (int): The number of documents loaded or ingested at once by the async API.
+            ingest_batch_size (Optional[int]): The number of chunks embedded and written to the store at a time.
+                Defaults to `embedding_batch_size * embedding_max_workers`, so every parallel worker gets a batch.
+            pdf_workers (int): The number of processes extracting PDF pages. Defaults to 1 (no process pool).
+            backend (str): The vector index backend ("chroma", "numpy" or "hnsw"). Defaults to "chroma".
+            index_params (Optional[Dict[str, int]]): HNSW build and search parameters ("M", "ef_construction",
+                "ef_search") for the "hnsw" backend, or for Chroma's own index when a collection is created.
+            vector_dtype (str): How the "numpy" and "hnsw" backends store vectors ("float32", "float16" or "int8").
+                Exact float16 search is much slower than float32, since NumPy upcasts float16 without SIMD;
+                prefer "int8" (with `rescore`) to save memory.
+            rescore (Optional[bool]): Whether to keep float32 vectors on disk and rescore the top quantized candidates
+                with them. Fixed when a collection is created; defaults to how an existing collection was created, else False.
+            embedding_backend (str): The CPU inference backend for HuggingFace models ("torch", "torch-int8" or "onnx").
+            embedding_dimensions (Optional[int]): The size of shortened text-embedding-3 vectors. Defaults to the full size.
+            splitter (str): The text splitter ("recursive" or "fast"). The fast splitter is only used on single-line
+                text such as transcripts, where it cuts where the recursive one does; paragraph text always goes
+                through the recursive splitter, since the fast one cuts it differently, which would change chunk
+                IDs and embed already stored sources again when re-ingested.
+            chunk_encoding (Optional[str]): The tiktoken encoding (e.g. "cl100k_base") to measure `chunk_size` and
+                `chunk_overlap` in tokens with. Defaults to measuring characters.
         """
+        if backend not in SUPPORTED_VECTOR_BACKENDS:
+            raise ValueError(f"Unsupported vector store backend: {backend}")
+        if splitter not in SUPPORTED_TEXT_SPLITTERS:
+            raise ValueError(f"Unsupported text splitter: {splitter}")
+        if backend == "chroma" and vector_dtype != SUPPORTED_VECTOR_DTYPES[0]:
+            raise ValueError("Quantized vectors are only supported by the numpy and hnsw backends")
+
         self.collection_name = embedding_provider + "-" + collection_name
+        if vector_dtype != SUPPORTED_VECTOR_DTYPES[0]:
+            # Quantized collections live next to, not inside, the float32 ones
+            self.collection_name += "-" + vector_dtype
+        if embedding_dimensions:
+            # Vectors of different sizes can never share a collection
+            self.collection_name += f"-{embedding_dimensions}d"
         self.embeddingClient = EmbeddingClient(
             provider=embedding_provider,
             model_name=embedding_model_name,
-            api_key=embedding_api_key
+            api_key=embedding_api_key,
+            batch_size=embedding_batch_size,
+            max_workers=embedding_max_workers,
+            backend=embedding_backend,
+            dimensions=embedding_dimensions
         )
-        self.text_splitter = RecursiveCharacterTextSplitter(
+        if chunk_encoding:
+            self.text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+                encoding_name=chunk_encoding,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap
+            )
+        else:
+            self.text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap
+            )
+        # Only cuts single-line text (transcripts), where its chunks match the recursive splitter's
+        self.__fast_splitter = FastTextSplitter(
             chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
-        )
-        self.store = None
+            chunk_overlap=chunk_overlap,
+            encoding=chunk_encoding
+        ) if splitter == "fast" else None
+        self.__store = None
+        self.__store_lock = threading.Lock()
+        self.__lexical_index = None
+        self.last_ingest_stats = IngestStats()
+        self.max_concurrency = max_concurrency
+        self.ingest_batch_size = ingest_batch_size or embedding_batch_size * embedding_max_workers
+        self.pdf_workers = pdf_workers
+        self.backend = backend
+        self.index_params = index_params or {}
+        self.vector_dtype = vector_dtype
+        self.rescore = rescore
+        self.persist_directory = PERSIST_DIRECTORY if backend == "chroma" else NUMPY_PERSIST_DIRECTORY
+        self.__semaphores = {}
 
-        # Create directory if it doesn't exist
-        os.makedirs(PERSIST_DIRECTORY, exist_ok=True)
+    @property
+    def store(self) -> BaseVectorStore:
+        """The underlying vector store, loaded on first use"""
+        if self.__store is None:
+            with self.__store_lock:
+                if self.__store is None:
+                    self.load_store()
+        return self.__store
+
+    @store.setter
+    def store(self, store: BaseVectorStore) -> None:
+        self.__store = store
+
+    @property
+    def lexical_index(self) -> BM25Index:
+        """The BM25 index over the chunks of the collection, loaded on first use"""
+        if self.__lexical_index is None:
+            path = self.__lexical_index_path()
+            self.__lexical_index = store_registry.get_store(("lexical", path), lambda: BM25Index(path))
+        return self.__lexical_index
+
+    def __lexical_index_path(self) -> str:
+        """Get the file of the collection's BM25 index"""
+        return os.path.abspath(os.path.join(LEXICAL_INDEX_DIRECTORY, f"{self.backend}-{self.collection_name}.jsonl"))
+
+    def __has_lexical_index(self) -> bool:
+        """Whether a lexical or hybrid query created the collection's BM25 index, which ingestion then keeps in sync"""
+        return self.__lexical_index is not None or os.path.exists(self.__lexical_index_path())
+
+    def __sync_lexical_index(self) -> BM25Index:
+        """Create the BM25 index if needed and index the stored chunks it is missing, without embedding anything"""
+        index = self.lexical_index
+        path = self.__lexical_index_path()
+        if not os.path.exists(path):
+            # Marks the collection as lexically searched, so every later ingest indexes its chunks
+            open(path, "ab").close()
+
+        store = self.__raw_store()
+        if isinstance(store, (NumpyStoreView, NumpyVectorStore)):
+            if index.count() >= store.count():
+                return index
+            ids = [id for id in store.get_ids() if id not in index]
+            for start in range(0, len(ids), 1000):
+                documents = store.get_by_ids(ids[start:start + 1000])
+                index.add_documents(documents, [document.id for document in documents])
+        else:
+            if index.count() >= store._collection.count():
+                return index
+            ids = [id for id in store.get(include=[])["ids"] if id not in index]
+            for start in range(0, len(ids), 1000):
+                result = store.get(ids=ids[start:start + 1000], include=["documents", "metadatas"])
+                index.add_documents(
+                    [Document(page_content=text, metadata=metadata or {}) for text, metadata in
+                     zip(result["documents"], result["metadatas"])],
+                    result["ids"]
+                )
 
-        # Try to load existing store
-        if os.path.exists(PERSIST_DIRECTORY):
-            self.load_store()
+        query_cache.bump(self.collection_key)
+        return index
+
+    @property
+    def collection_key(self) -> Tuple[str, str, str]:
+        """Identifies the collection across VectorStore instances, e.g. for cached query results"""
+        return (self.backend, os.path.abspath(self.persist_directory), self.collection_name)
 
     def load_store(self) -> None:
-        """Load vector store from the data directory"""
-        self.store = Chroma(
-            collection_name=self.collection_name,
-            persist_directory=PERSIST_DIRECTORY,
-            embedding_function=self.embeddingClient.embedder
-        )
-    
+        """Load vector store from the data directory, sharing open handles across instances"""
+        # Create directory if it doesn't exist
+        os.makedirs(self.persist_directory, exist_ok=True)
+
+        if self.backend == "chroma":
+            # Chroma coordinates writers itself, so every embedding model and key gets its own handle
+            key = (*self.collection_key, *self.embeddingClient.cache_key)
+            self.store = store_registry.get_store(key, lambda: self.__open_store(self.embeddingClient.embedder))
+        else:
+            # Files written by one handle only, whoever asks; each instance embeds through its own view
+            collection = store_registry.get_store(self.collection_key, self.__open_store)
+            if self.rescore is not None and collection.dtype != SUPPORTED_VECTOR_DTYPES[0] and collection.rescore != self.rescore:
+                raise ValueError(f"Collection {self.collection_name} is open with rescore={collection.rescore}, not {self.rescore}")
+            self.store = collection.bind(self.embeddingClient.embedder, self.embeddingClient.model_id)
+
+    def __raw_store(self) -> BaseVectorStore:
+        """Get a handle that can read and delete chunks, without building the embedding model if not loaded yet"""
+        if self.__store is not None:
+            return self.__store
+
+        os.makedirs(self.persist_directory, exist_ok=True)
+        return store_registry.get_store(self.collection_key, self.__open_store)
+
+    def __open_store(self, embedding_function: Optional[Embeddings]=None) -> BaseVectorStore:
+        """Open the vector store of the configured backend, embedding with `embedding_function` (Chroma only)"""
+        if self.backend == "numpy":
+            return NumpyVectorStore(
+                collection_name=self.collection_name,
+                persist_directory=self.persist_directory,
+                embedding_function=None,
+                dtype=self.vector_dtype,
+                rescore=self.rescore
+            )
+        elif self.backend == "hnsw":
+            return HNSWVectorStore(
+                collection_name=self.collection_name,
+                persist_directory=self.persist_directory,
+                embedding_function=None,
+                dtype=self.vector_dtype,
+                rescore=self.rescore,
+                **self.index_params
+            )
+        else:
+            return Chroma(
+                collection_name=self.collection_name,
+                client=store_registry.get_client(os.path.abspath(self.persist_directory)),
+                embedding_function=embedding_function,
+                collection_metadata={
+                    CHROMA_HNSW_PARAMS[name]: value for name, value in self.index_params.items()
+                } or None
+            )
+
     def load_document(
         self,
-        source: str,
+        source: Union[str, BinaryIO],
         source_type: str="pdf"
     ) -> List[Document]:
         """
         Load a document from a source
 
         Args:
-            source (str): The source to load the document from.
+            source (Union[str, BinaryIO]): The source to load the document from (PDFs may also be an in-memory file).
             source_type (str): The type of the source ("pdf", "txt", "md", "yt", "article). Defaults to "pdf".
 
         Returns:
             List[Document]: List of documents loaded from the source.
         """
-        if source_type == "pdf":
-            loader = PyPDFLoader(source)
+        return self.__create_loader(source, source_type).load()
+
+    def lazy_load_document(
+        self,
+        source: Union[str, BinaryIO],
+        source_type: str="pdf"
+    ) -> Iterator[Document]:
+        """
+        Lazily load a document from a source, one page or part at a time
+
+        Args:
+            source (Union[str, BinaryIO]): The source to load the document from (PDFs may also be an in-memory file).
+            source_type (str): The type of the source ("pdf", "youtube", "news"). Defaults to "pdf".
+
+        Returns:
+            Iterator[Document]: Iterator over the documents loaded from the source.
+        """
+        return self.__create_loader(source, source_type).lazy_load()
+
+    def __create_loader(self, source: Union[str, BinaryIO], source_type: str) -> BaseLoader:
+        """Create the document loader for a source type"""
+        if source_type == "pdf" and not isinstance(source, str):
+            if self.pdf_workers > 1:
+                # Every worker process needs its own copy of the content
+                if isinstance(source, (bytes, memoryview)):
+                    content = bytes(source)
+                else:
+                    source.seek(0)
+                    content = source.read()
+                return ParallelPDFLoader(
+                    content,
+                    max_workers=self.pdf_workers,
+                    source_name=getattr(source, "name", None)
+                )
+            return InMemoryPDFLoader(source)
+        elif source_type == "pdf" and self.pdf_workers > 1:
+            return ParallelPDFLoader(source, max_workers=self.pdf_workers)
+        elif source_type == "pdf":
+            return PyPDFLoader(source)
         elif source_type == "youtube":
-            loader = YoutubeLoader.from_youtube_url(source)
+            return TranscriptLoader(source)
         elif source_type == "news":
-            loader = ArticleLoader(source)
+            return ArticleLoader(source)
         else:
             raise ValueError(f"Unsupported source type: {source_type}")
 
-        return loader.load()
+    async def aload_document(
+        self,
+        source: str,
+        source_type: str="pdf"
+    ) -> List[Document]:
+        """
+        Asynchronously load a document from a source
+
+        Args:
+            source (str): The source to load the document from.
+            source_type (str): The type of the source ("pdf", "youtube", "news"). Defaults to "pdf".
+
+        Returns:
+            List[Document]: List of documents loaded from the source.
+        """
+        async with self.__semaphore():
+            return await asyncio.to_thread(self.load_document, source, source_type)
 
     def process_documents(self, documents: List[Document]) -> List[Document]:
         """
@@ -109,39 +389,69 @@ class VectorStore:
         # Clean document metadata
         cleaned_documents = filter_complex_metadata(documents)
 
+        # Tag every chunk with its source so retrieval can be scoped to it.
+        # Uploads are identified by their content, their file name is only for display
+        for document in cleaned_documents:
+            content_hash = document.metadata.get(CONTENT_HASH_KEY)
+            document.metadata[SOURCE_ID_KEY] = (
+                content_hash[:16] if content_hash else self.source_id(str(document.metadata.get("source", "")))
+            )
+
         # Split the documents into chunks
-        chunks = self.text_splitter.split_documents(cleaned_documents)
+        chunks = []
+        for document in cleaned_documents:
+            if self.__fast_splitter and "\n" not in document.page_content:
+                chunks.extend(self.__fast_splitter.split_documents([document]))
+            else:
+                chunks.extend(self.text_splitter.split_documents([document]))
 
         return chunks
 
+    def iter_chunks(self, documents: Iterable[Document]) -> Iterator[Document]:
+        """
+        Lazily split documents into chunks, one document at a time
+
+        Args:
+            documents (Iterable[Document]): The documents to process.
+
+        Returns:
+            Iterator[Document]: Iterator over the processed documents.
+        """
+        for document in documents:
+            yield from self.process_documents([document])
+
+    async def aprocess_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        Asynchronously process a list of documents by splitting them into chunks
+
+        Args:
+            documents (List[Document]): The documents to process.
+
+        Returns:
+            List[Document]: List of processed documents.
+        """
+        return await asyncio.to_thread(self.process_documents, documents)
+
     def create_store(self, documents: List[Document]) -> List[Document]:
         """
         Create a new vector store from a list of documents
 
         Args:
             documents (List[Document]): The documents to save to the store.
-            metadata (Optional[Dict]): Additional metadata for the documents.
         """
-        # Process the documents
-        processed_documents = self.process_documents(documents)
+        self.load_store()
 
-        # Create the store
-        self.store = Chroma.from_documents(
-            documents=processed_documents,
-            embedding=self.embeddingClient.embedder,
-            collection_name=self.collection_name,
-            persist_directory=PERSIST_DIRECTORY
-        )
-
-        return processed_documents
+        return self.add_to_store(documents)
 
     def add_to_store(self, documents: List[Document]) -> List[Document]:
         """
-        Add documents to the existing vector store
+        Add documents to the existing vector store.
+
+        Chunks already present in the store (same source and content) are not
+        embedded again. The outcome is recorded in `last_ingest_stats`.
 
         Args:
             documents (List[Document]): The documents to add to the store.
-            metadata (Optional[Dict]): Additional metadata for the documents.
         """
         if not self.store:
             raise RuntimeError("Vector store not found. Please create or load the store first.")
@@ -149,11 +459,305 @@ class VectorStore:
         # Process the documents
         processed_documents = self.process_documents(documents)
 
-        # Add the documents to the store
-        self.store.add_documents(processed_documents)
+        self.add_chunks(processed_documents)
 
         return processed_documents
 
+    def add_chunks(self, chunks: Iterable[Document]) -> IngestStats:
+        """
+        Embed and store chunks that were already processed, skipping the ones already stored
+
+        Args:
+            chunks (Iterable[Document]): The chunks, as returned by `process_documents` or `iter_chunks`.
+
+        Returns:
+            IngestStats: The number of chunks added and reused.
+        """
+        if not self.store:
+            raise RuntimeError("Vector store not found. Please create or load the store first.")
+
+        self.last_ingest_stats = self.__store_chunks(chunks)
+
+        return self.last_ingest_stats
+
+    def stream_document(
+        self,
+        source: str,
+        source_type: str="pdf"
+    ) -> IngestStats:
+        """
+        Load, split, embed and store a document without holding it in memory.
+
+        Pages are split as they are loaded and the chunks are written in
+        batches of `ingest_batch_size`, so memory use does not grow with the
+        size of the document.
+
+        Args:
+            source (str): The source to load the document from.
+            source_type (str): The type of the source ("pdf", "youtube", "news"). Defaults to "pdf".
+
+        Returns:
+            IngestStats: The number of chunks added and reused.
+        """
+        if not self.store:
+            raise RuntimeError("Vector store not found. Please create or load the store first.")
+
+        return self.add_chunks(self.iter_chunks(self.lazy_load_document(source, source_type)))
+
+    def __store_chunks(self, chunks: Iterable[Document]) -> IngestStats:
+        """Embed and write chunks in batches, skipping the ones already stored"""
+        stats = IngestStats()
+        batch = []
+
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= self.ingest_batch_size:
+                self.__store_batch(batch, stats)
+                batch = []
+
+        if batch:
+            self.__store_batch(batch, stats)
+
+        get_retention_log().record(self.collection_key, stats.source_chunks)
+
+        return stats
+
+    def __store_batch(self, batch: List[Document], stats: IngestStats) -> None:
+        """Embed and write a single batch of chunks"""
+        # Only embed the chunks the store has not seen yet
+        new_documents, new_ids = self.__filter_new_documents(batch)
+        if new_documents:
+            self.store.add_documents(new_documents, ids=new_ids)
+
+        # Only collections searched lexically pay for a second copy of their text
+        indexed = 0
+        if self.__has_lexical_index():
+            indexed = self.lexical_index.add_documents(batch, [self.chunk_id(document) for document in batch])
+
+        if new_documents or indexed:
+            # Cached results of the collection may now be missing chunks
+            query_cache.bump(self.collection_key)
+
+        stats.added += len(new_documents)
+        stats.reused += len(batch) - len(new_documents)
+        for document in batch:
+            if SOURCE_ID_KEY in document.metadata:
+                source_id = document.metadata[SOURCE_ID_KEY]
+                stats.source_chunks[source_id] = stats.source_chunks.get(source_id, 0) + 1
+
+    async def acreate_store(self, documents: List[Document]) -> List[Document]:
+        """
+        Asynchronously create a new vector store from a list of documents
+
+        Args:
+            documents (List[Document]): The documents to save to the store.
+        """
+        await asyncio.to_thread(self.load_store)
+
+        return await self.aadd_to_store(documents)
+
+    async def aadd_to_store(self, documents: List[Document]) -> List[Document]:
+        """
+        Asynchronously add documents to the existing vector store.
+
+        At most `max_concurrency` calls embed and write at the same time.
+
+        Args:
+            documents (List[Document]): The documents to add to the store.
+        """
+        # The first access opens the store and its index from disk, which must not block the event loop
+        store = self.__store if self.__store is not None else await asyncio.to_thread(lambda: self.store)
+        if not store:
+            raise RuntimeError("Vector store not found. Please create or load the store first.")
+
+        async with self.__semaphore():
+            processed_documents = await self.aprocess_documents(documents)
+
+            new_documents, new_ids = await asyncio.to_thread(self.__filter_new_documents, processed_documents)
+            if new_documents:
+                await store.aadd_documents(new_documents, ids=new_ids)
+
+            indexed = await asyncio.to_thread(
+                lambda: self.lexical_index.add_documents(
+                    processed_documents,
+                    [self.chunk_id(document) for document in processed_documents]
+                ) if self.__has_lexical_index() else 0
+            )
+
+            if new_documents or indexed:
+                query_cache.bump(self.collection_key)
+
+        self.last_ingest_stats = IngestStats(
+            added=len(new_documents),
+            reused=len(processed_documents) - len(new_documents),
+            source_chunks=dict(Counter(
+                document.metadata[SOURCE_ID_KEY] for document in processed_documents if SOURCE_ID_KEY in document.metadata
+            ))
+        )
+        await asyncio.to_thread(get_retention_log().record, self.collection_key, self.last_ingest_stats.source_chunks)
+
+        return processed_documents
+
+    async def aingest(self, sources: List[str], source_type: str="pdf") -> List[List[Document]]:
+        """
+        Asynchronously load and add many sources to the store
+
+        Args:
+            sources (List[str]): The sources to ingest.
+            source_type (str): The type of the sources ("pdf", "youtube", "news"). Defaults to "pdf".
+
+        Returns:
+            List[List[Document]]: The processed documents of each source, in order.
+        """
+        async def ingest(source: str) -> List[Document]:
+            documents = await self.aload_document(source, source_type)
+            return await self.aadd_to_store(documents)
+
+        return await asyncio.gather(*(ingest(source) for source in sources))
+
+    @staticmethod
+    def source_id(source: str) -> str:
+        """
+        Build a stable ID for a source
+
+        Args:
+            source (str): The source of a document (URL, video ID or file path).
+
+        Returns:
+            str: The hex digest identifying the source.
+        """
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def source_filter(source_ids: List[str]) -> Dict:
+        """
+        Build a metadata filter matching the chunks of the given sources
+
+        Args:
+            source_ids (List[str]): The IDs of the sources to match.
+
+        Returns:
+            Dict: The filter, usable with every backend.
+        """
+        if len(source_ids) == 1:
+            return {SOURCE_ID_KEY: source_ids[0]}
+        return {SOURCE_ID_KEY: {"$in": list(source_ids)}}
+
+    @staticmethod
+    def chunk_id(document: Document) -> str:
+        """
+        Build a stable ID for a chunk from its source and content
+
+        Args:
+            document (Document): The chunk to identify.
+
+        Returns:
+            str: The hex digest identifying the chunk.
+        """
+        source = str(document.metadata.get(CONTENT_HASH_KEY) or document.metadata.get("source", ""))
+        return hashlib.sha256(f"{source}\x00{document.page_content}".encode("utf-8")).hexdigest()
+
+    def __filter_new_documents(self, documents: List[Document]) -> Tuple[List[Document], List[str]]:
+        """Drop chunks that are duplicated in the batch or already stored"""
+        unique = {}
+        for document in documents:
+            unique.setdefault(self.chunk_id(document), document)
+
+        existing_ids = {document.id for document in self.store.get_by_ids(list(unique))}
+        new_ids = [chunk_id for chunk_id in unique if chunk_id not in existing_ids]
+
+        return [unique[chunk_id] for chunk_id in new_ids], new_ids
+
+    def __semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency limiter for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if loop not in self.__semaphores:
+            self.__semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self.__semaphores[loop]
+
+    def touch_sources(self, source_ids: List[str]) -> None:
+        """Mark sources as accessed, so the retention policy keeps them longer"""
+        get_retention_log().touch(self.collection_key, source_ids)
+
+    def delete_sources(self, source_ids: List[str]) -> int:
+        """
+        Delete every chunk of the given sources from the store and the lexical index
+
+        Args:
+            source_ids (List[str]): The IDs of the sources to delete.
+
+        Returns:
+            int: The number of chunks deleted.
+        """
+        if not source_ids:
+            return 0
+
+        # Deleting embeds nothing, so compaction never loads a model or resolves an API key
+        store = self.__raw_store()
+        where = self.source_filter(source_ids)
+        if isinstance(store, (NumpyStoreView, NumpyVectorStore)):
+            ids = store.get_ids(where)
+        else:
+            ids = store.get(where=where, include=[])["ids"]
+
+        if ids:
+            store.delete(ids)
+        indexed = self.lexical_index.delete(ids) if ids and self.__has_lexical_index() else 0
+        if ids or indexed:
+            query_cache.bump(self.collection_key)
+
+        return len(ids)
+
+    def compact(self, policy: RetentionPolicy) -> CompactionReport:
+        """
+        Delete the sources a retention policy evicts and reclaim their disk space
+
+        Sources ingested before retention tracking existed are never evicted.
+
+        Args:
+            policy (RetentionPolicy): The TTL and maximum chunk count of the collection.
+
+        Returns:
+            CompactionReport: The sources and chunks removed and the bytes freed, measured on the
+                collection for the numpy and hnsw backends and on the whole directory for Chroma.
+        """
+        start = time.perf_counter()
+        lexical_path = self.__lexical_index_path()
+        if self.backend == "chroma":
+            # Collections share Chroma's SQLite file, so only the whole directory can be measured
+            paths = [self.persist_directory, lexical_path]
+            scope = "directory"
+        else:
+            paths = [os.path.join(self.persist_directory, self.collection_name), lexical_path]
+            scope = "collection"
+        report = CompactionReport(collection=self.collection_name, bytes_before=disk_usage(*paths), bytes_scope=scope)
+
+        log = get_retention_log()
+        report.sources_removed = log.expired(self.collection_key, policy)
+        if report.sources_removed:
+            report.chunks_removed = self.delete_sources(report.sources_removed)
+            log.forget(self.collection_key, report.sources_removed)
+
+            if self.backend == "chroma":
+                self.__vacuum()
+
+        report.bytes_after = disk_usage(*paths)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def __vacuum(self) -> None:
+        """Shrink Chroma's SQLite file after deletes, which otherwise only leave free pages behind"""
+        path = os.path.join(self.persist_directory, "chroma.sqlite3")
+        if not os.path.exists(path):
+            return
+
+        try:
+            with sqlite3.connect(path) as connection:
+                connection.execute("VACUUM")
+        except sqlite3.OperationalError:
+            # Busy with a write; the pages are reused by later inserts either way
+            pass
+
     def as_retriever(self, **kwargs) -> VectorStoreRetriever:
         """
         Get the vector store as a retriever object
@@ -168,3 +772,89 @@ class VectorStore:
             raise RuntimeError("Vector store not found. Please create or load the store first.")
 
         return self.store.as_retriever(**kwargs)
+
+    def as_source_retriever(self, source_ids: List[str], **kwargs) -> VectorStoreRetriever:
+        """
+        Get a retriever that only searches the chunks of the given sources
+
+        Args:
+            source_ids (List[str]): The IDs of the sources to search.
+            **kwargs: Additional keyword arguments to pass to the retriever.
+
+        Returns:
+            VectorStoreRetriever: A vector store retriever instance.
+        """
+        search_kwargs = dict(kwargs.pop("search_kwargs", {}))
+        search_kwargs["filter"] = self.source_filter(source_ids)
+
+        return self.as_retriever(search_kwargs=search_kwargs, **kwargs)
+
+    def as_lexical_retriever(self, source_ids: Optional[List[str]]=None, k: int=4) -> LexicalRetriever:
+        """
+        Get a BM25 retriever over the lexical index, which never embeds the query
+
+        The first lexical or hybrid retriever of a collection builds its index from the stored chunks.
+        Until then, ingestion does not index the chunks a second time.
+
+        Args:
+            source_ids (Optional[List[str]]): Only search the chunks of these sources.
+            k (int): The number of chunks to retrieve.
+
+        Returns:
+            LexicalRetriever: A lexical retriever instance.
+        """
+        return LexicalRetriever(index=self.__sync_lexical_index(), k=k, source_ids=source_ids or None)
+
+    def as_hybrid_retriever(
+        self,
+        source_ids: Optional[List[str]]=None,
+        k: int=4,
+        fetch_k: int=20
+    ) -> HybridRetriever:
+        """
+        Get a retriever fusing vector and BM25 results with reciprocal rank fusion
+
+        Args:
+            source_ids (Optional[List[str]]): Only search the chunks of these sources.
+            k (int): The number of chunks to retrieve.
+            fetch_k (int): The number of candidates each of the two searches contributes to the fusion.
+
+        Returns:
+            HybridRetriever: A hybrid retriever instance.
+        """
+        if source_ids:
+            vector_retriever = self.as_source_retriever(source_ids, search_kwargs={"k": fetch_k})
+        else:
+            vector_retriever = self.as_retriever(search_kwargs={"k": fetch_k})
+
+        return HybridRetriever(
+            vector_retriever=vector_retriever,
+            lexical_retriever=self.as_lexical_retriever(source_ids, k=fetch_k),
+            k=k
+        )
+
+    def as_cached_retriever(self, retriever: BaseRetriever, search_key: Hashable) -> CachedRetriever:
+        """
+        Wrap a retriever over this collection so repeated queries are served from the query cache
+
+        Args:
+            retriever (BaseRetriever): The retriever to wrap.
+            search_key (Hashable): Identifies the kind of search and its parameters (mode, sources, k).
+
+        Returns:
+            CachedRetriever: A caching retriever instance.
+        """
+        return CachedRetriever(
+            retriever=retriever,
+            store=self.store,
+            cache=query_cache,
+            collection_key=self.collection_key,
+            search_key=search_key
+        )
+
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get the hit rates and sizes of the embedding and query caches"""
+        stats = {"queries": query_cache.stats()}
+        if self.embeddingClient.cache is not None:
+            stats["embeddings"] = self.embeddingClient.cache.stats()
+        return stats
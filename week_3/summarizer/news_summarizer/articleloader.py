@@ -1,18 +1,60 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from langchain_community.document_loaders.base import BaseLoader
 from langchain_core.documents import Document
 from newspaper import Article
 
+from core.document_cache import DocumentCache, get_document_cache
+
+TRACKING_PARAMETERS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize an article URL so that equivalent links share one cache entry.
+
+    The scheme and host are lowercased, default ports, fragments, trailing slashes
+    and tracking parameters are dropped, and the remaining query parameters are sorted.
+
+    Args:
+        url (str): The URL to normalize.
+
+    Returns:
+        str: The normalized URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "http"
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host += f":{parts.port}"
+
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith(TRACKING_PARAMETERS)
+    )
+    return urlunsplit((scheme, host, parts.path.rstrip("/") or "/", urlencode(query), ""))
+
 class ArticleLoader(BaseLoader):
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        html: Optional[str]=None,
+        cache: Optional[DocumentCache]=None,
+        use_cache: bool=True
+    ):
         """
         Initialize the ArticleLoader.
 
         Args:
             url (str): The URL of the article to load.
+            html (Optional[str]): The HTML of the article, if already fetched. It is parsed without any download.
+            cache (Optional[DocumentCache]): The cache of fetched and parsed articles. Defaults to the shared article cache.
+            use_cache (bool): Whether to read and write the cache.
         """
         self.url = url
+        self.html = html
+        self.cache = (cache or get_document_cache()) if use_cache else None
 
     def load(self) -> List[Document]:
         """
@@ -21,21 +63,54 @@ class ArticleLoader(BaseLoader):
         Returns:
             List[Document]: A list of Document objects representing the article.
         """
+        key = normalize_url(self.url)
+        html = self.html
+        if self.cache is not None and html is None:
+            html, documents = self.cache.get(key)
+            if documents is not None:
+                return documents
+
         try:
-            # Download and parse the article
-            article = Article(self.url)
-            article.download()
-            article.parse()
-
-            return [
-                Document(page_content=article.text, metadata={
-                    "title": article.title,
-                    "url": article.url,
-                    "authors": article.authors,
-                    "published_date": article.publish_date,
-                    "keywords": article.keywords,
-                    "summary": article.summary
-                })
-            ]
+            documents = self.parse(html)
         except Exception as e:
             raise RuntimeError(f"Error downloading and parsing the article: {e}")
+
+        if self.cache is not None:
+            self.cache.put(key, self.html, documents)
+
+        return documents
+
+    def parse(self, html: Optional[str]=None) -> List[Document]:
+        """
+        Parse the article into document objects, downloading it unless its HTML is given.
+
+        Args:
+            html (Optional[str]): The HTML of the article.
+
+        Returns:
+            List[Document]: A list of Document objects representing the article.
+        """
+        article = Article(self.url)
+        if html is None:
+            article.download()
+        else:
+            article.download(input_html=html)
+        article.parse()
+        self.html = article.html
+
+        published_date = article.publish_date
+        if isinstance(published_date, datetime):
+            # Kept as text so the date survives metadata filtering and the cache alike
+            published_date = published_date.isoformat()
+
+        return [
+            Document(page_content=article.text, metadata={
+                "source": self.url,
+                "title": article.title,
+                "url": article.url,
+                "authors": article.authors,
+                "published_date": published_date,
+                "keywords": article.keywords,
+                "summary": article.summary
+            })
+        ]
@@ -1,10 +1,14 @@
-from typing import List, Optional
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 
 from langchain_core.documents import Document
 from langchain_core.prompts import PromptTemplate
 
 from core.llm import LLMClient
-from core.storage import VectorStore
+from core.storage import SUPPORTED_RETRIEVAL_MODES, VectorStore
 from utils.model_util import (
     SUPPORTED_EMBEDDING_PROVIDERS,
     SUPPORTED_LLM_PROVIDERS,
@@ -12,6 +16,16 @@ from utils.model_util import (
     SUPPORTED_OPENAI_EMBEDDING_MODELS
 )
 
+@dataclass
+class ArticleIngestResult:
+    """The outcome of ingesting one article URL"""
+    url: str
+    status: str
+    chunks: int=0
+    fetch_seconds: float=0.0
+    store_seconds: float=0.0
+    error: Optional[str]=None
+
 class NewsSummarizer:
     def __init__(
         self,
@@ -23,6 +37,7 @@ class NewsSummarizer:
         embedding_api_key: Optional[str]=None,
         chunk_size: int=1024,
         chunk_overlap: int=200,
+        retrieval_mode: str=SUPPORTED_RETRIEVAL_MODES[0],
     ):
         """
         Initialize the NewsSummarizer with choice of model.
@@ -36,6 +51,7 @@ class NewsSummarizer:
             embedding_api_key (Optional[str]): The API key to use for the embedding model.
             chunk_size (int): The size of the chunks to split the documents into.
             chunk_overlap (int): The overlap between the chunks.
+            retrieval_mode (str): How follow-up questions retrieve chunks ("vector", "hybrid" or "lexical").
         """
         self.llm_provider = llm_provider
         self.llm_name = llm_name
@@ -59,7 +75,9 @@ class NewsSummarizer:
             model_name=self.llm_name,
             api_key=self.llm_api_key,
             store=self.store,
+            retrieval_mode=retrieval_mode,
         )
+        self.active_sources = []
 
     def download_and_process_article(self, url: str) -> List[Document]:
         """
@@ -69,14 +87,75 @@ class NewsSummarizer:
             url (str): The URL of the news article to download and process.
         """
         documents = self.store.load_document(source=url, source_type="news")
+        processed_documents = self.store.add_to_store(documents)
 
-        try:
-            processed_documents = self.store.add_to_store(documents)
-        except Exception:
-            processed_documents = self.store.create_store(documents)
+        # Answer follow-up questions from this source only
+        self.active_sources = self.client.set_document_sources(processed_documents)
 
         return processed_documents
 
+    def download_and_process_articles(self, urls: List[str], max_workers: int=8) -> List[ArticleIngestResult]:
+        """
+        Download and process many news articles concurrently.
+
+        Articles are fetched and parsed by a bounded pool of threads, then all of
+        their chunks are embedded and stored together so that embedding requests
+        are batched across articles. A failing URL does not stop the others.
+
+        Args:
+            urls (List[str]): The URLs of the news articles to download and process.
+            max_workers (int): The maximum number of articles fetched at the same time.
+
+        Returns:
+            List[ArticleIngestResult]: The status and timings of each distinct URL, in order.
+                `store_seconds` is the time of the shared embedding and storage step.
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return []
+
+        def fetch(url: str) -> Tuple[Optional[List[Document]], ArticleIngestResult]:
+            start = time.perf_counter()
+            try:
+                documents = self.store.load_document(source=url, source_type="news")
+                status = "ok" if any(document.page_content.strip() for document in documents) else "empty"
+                result = ArticleIngestResult(url=url, status=status)
+            except Exception as e:
+                documents, result = None, ArticleIngestResult(url=url, status="error", error=str(e))
+            result.fetch_seconds = time.perf_counter() - start
+            return documents, result
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as executor:
+            fetched = list(executor.map(fetch, urls))
+
+        documents = [document for loaded, result in fetched if result.status == "ok" for document in loaded]
+        results = [result for _, result in fetched]
+        if not documents:
+            return results
+
+        start = time.perf_counter()
+        try:
+            processed_documents = self.store.add_to_store(documents)
+        except Exception as e:
+            store_seconds = time.perf_counter() - start
+            for result in results:
+                if result.status == "ok":
+                    result.status, result.error, result.store_seconds = "error", str(e), store_seconds
+            return results
+        store_seconds = time.perf_counter() - start
+
+        # Cached articles keep the URL they were first fetched from, which may differ from the requested one
+        chunks = Counter(document.metadata.get("source") for document in processed_documents)
+        for loaded, result in fetched:
+            if result.status == "ok":
+                result.chunks = sum(chunks[source] for source in {document.metadata.get("source") for document in loaded})
+                result.store_seconds = store_seconds
+
+        # Answer follow-up questions from the ingested articles only
+        self.active_sources = self.client.set_document_sources(processed_documents)
+
+        return results
+
     def summarize_article(self, url: str, summary_type: str="concise") -> str:
         """
         Summarize a news article from a URL.
@@ -0,0 +1,192 @@
+import hashlib
+import io
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from langchain_community.document_loaders.base import BaseLoader
+from langchain_core.documents import Document
+from pypdf import PdfReader
+
+# Metadata key holding the SHA-256 of an in-memory PDF, which identifies the upload
+CONTENT_HASH_KEY = "content_hash"
+
+# Metadata keys holding dates, which PDFs write like D:20240131120000+01'00'
+PDF_DATE_KEYS = ("creationdate", "moddate")
+
+# The PDF opened by each worker process of ParallelPDFLoader
+_worker_reader: Optional[PdfReader] = None
+
+def _open_worker_reader(source: Union[str, bytes]) -> None:
+    """Open the PDF once per worker process, so tasks only carry their page range"""
+    global _worker_reader
+    _worker_reader = PdfReader(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+def _extract_pages(start: int, stop: int) -> List[Tuple[int, str, str]]:
+    """Extract the text of pages [start, stop) of the worker's PDF as (page, page_label, text) tuples"""
+    return [
+        (page, _worker_reader.page_labels[page], _worker_reader.pages[page].extract_text())
+        for page in range(start, stop)
+    ]
+
+def _content_hash(source: Union[bytes, memoryview, BinaryIO]) -> str:
+    """Hash the content of an in-memory PDF, reading streams in blocks rather than copying them whole"""
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, memoryview)):
+        digest.update(source)
+    else:
+        # BytesIO.getbuffer would copy a buffer shared with the uploaded bytes, so read it in blocks
+        position = source.tell()
+        source.seek(0)
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+        source.seek(position)
+    return digest.hexdigest()
+
+def _parse_pdf_date(value: str) -> str:
+    """Convert a PDF date to ISO 8601, keeping the value as is if it does not parse"""
+    try:
+        return datetime.strptime(value.replace("'", ""), "D:%Y%m%d%H%M%S%z").isoformat("T")
+    except ValueError:
+        return value
+
+def _document_metadata(
+    reader: PdfReader,
+    source: str,
+    total_pages: int,
+    content_hash: Optional[str]=None
+) -> Dict[str, Any]:
+    """Build the metadata shared by every page, normalized the way PyPDFLoader does"""
+    metadata = {"producer": "PyPDF", "creator": "PyPDF", "creationdate": ""}
+    for key, value in (reader.metadata or {}).items():
+        key = key.lstrip("/").lower()
+        value = value if isinstance(value, int) else str(value).strip()
+        metadata[key] = _parse_pdf_date(value) if key in PDF_DATE_KEYS and isinstance(value, str) else value
+
+    metadata["source"] = source
+    metadata["total_pages"] = total_pages
+    if content_hash:
+        metadata[CONTENT_HASH_KEY] = content_hash
+    return metadata
+
+def _page_document(text: str, metadata: Dict[str, Any], page: int, page_label: str) -> Document:
+    """Build the Document for a single PDF page"""
+    return Document(page_content=text.strip(), metadata={
+        **metadata,
+        "page": page,
+        "page_label": page_label
+    })
+
+class InMemoryPDFLoader(BaseLoader):
+    def __init__(self, source: Union[bytes, memoryview, BinaryIO], source_name: Optional[str]=None):
+        """
+        Initialize the InMemoryPDFLoader.
+
+        Args:
+            source (Union[bytes, memoryview, BinaryIO]): The PDF content, or a seekable stream over it
+                such as an uploaded file.
+            source_name (Optional[str]): The name recorded as the documents' source, for display.
+                Defaults to the stream's `name` attribute. The upload is identified by the hash of its content,
+                so two different files with the same name do not collide.
+        """
+        self.source = source
+        self.source_name = source_name or getattr(source, "name", "memory")
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Parse the PDF straight from memory, without writing it to disk.
+
+        Returns:
+            Iterator[Document]: One Document per page, in page order.
+        """
+        content_hash = _content_hash(self.source)
+        if isinstance(self.source, (bytes, memoryview)):
+            # BytesIO shares the buffer of a bytes object instead of copying it
+            stream = io.BytesIO(self.source if isinstance(self.source, bytes) else self.source.tobytes())
+        else:
+            stream = self.source
+            stream.seek(0)
+        reader = PdfReader(stream)
+        total_pages = len(reader.pages)
+        metadata = _document_metadata(reader, self.source_name, total_pages, content_hash)
+        for page in range(total_pages):
+            yield _page_document(
+                reader.pages[page].extract_text(),
+                metadata,
+                page,
+                reader.page_labels[page]
+            )
+
+class ParallelPDFLoader(BaseLoader):
+    def __init__(
+        self,
+        source: Union[str, bytes],
+        max_workers: Optional[int]=None,
+        pages_per_task: Optional[int]=None,
+        source_name: Optional[str]=None,
+        min_parallel_pages: int=100
+    ):
+        """
+        Initialize the ParallelPDFLoader.
+
+        Args:
+            source (Union[str, bytes]): The path of the PDF file to load, or its content.
+            max_workers (Optional[int]): The number of worker processes. Defaults to the number of CPUs.
+            pages_per_task (Optional[int]): The number of pages each worker extracts at a time.
+                Defaults to spreading the pages over two tasks per worker.
+            source_name (Optional[str]): The name recorded as the documents' source. Defaults to the path.
+                In-memory content is identified by its hash, the name being kept for display.
+            min_parallel_pages (int): Documents with fewer pages are extracted in this process. The workers
+                are spawned rather than forked, which is safe next to the app's threads but takes about
+                a second to start, as long as extracting around a hundred pages.
+        """
+        self.source = source
+        self.source_name = source_name or (source if isinstance(source, str) else "memory")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+        self.min_parallel_pages = min_parallel_pages
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Extract the pages of the PDF across a process pool.
+
+        Returns:
+            Iterator[Document]: One Document per page, in page order.
+        """
+        reader = PdfReader(io.BytesIO(self.source) if isinstance(self.source, bytes) else self.source)
+        total_pages = len(reader.pages)
+        if total_pages == 0:
+            return
+        content_hash = _content_hash(self.source) if isinstance(self.source, bytes) else None
+        metadata = _document_metadata(reader, self.source_name, total_pages, content_hash)
+
+        if total_pages < self.min_parallel_pages or self.max_workers <= 1:
+            for page in range(total_pages):
+                yield _page_document(reader.pages[page].extract_text(), metadata, page, reader.page_labels[page])
+            return
+
+        pages_per_task = self.pages_per_task or math.ceil(total_pages / (self.max_workers * 2))
+        ranges = [
+            (start, min(start + pages_per_task, total_pages))
+            for start in range(0, total_pages, pages_per_task)
+        ]
+
+        # Forking a process that runs other threads (the app server, embedding pools) can deadlock the child
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(ranges)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_open_worker_reader,
+            initargs=(self.source,)
+        ) as executor:
+            # map yields results in submission order, which keeps the pages ordered
+            results = executor.map(
+                _extract_pages,
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges]
+            )
+            for pages in results:
+                for page, page_label, text in pages:
+                    yield _page_document(text, metadata, page, page_label)
@@ -1,12 +1,10 @@
-import os
-import tempfile
-from typing import List, Optional
+from typing import BinaryIO, List, Optional
 
 from langchain_core.documents import Document
 from langchain_core.prompts import PromptTemplate
 
 from core.llm import LLMClient
-from core.storage import VectorStore
+from core.storage import SUPPORTED_RETRIEVAL_MODES, VectorStore
 from utils.model_util import (
     SUPPORTED_EMBEDDING_PROVIDERS,
     SUPPORTED_LLM_PROVIDERS,
@@ -25,6 +23,8 @@ class PDFSummarizer:
         embedding_api_key: Optional[str]=None,
         chunk_size: int=1024,
         chunk_overlap: int=200,
+        pdf_workers: int=1,
+        retrieval_mode: str=SUPPORTED_RETRIEVAL_MODES[0],
     ):
         """
         Initialize the UnstructuredSummarizer with choice of model.
@@ -36,6 +36,8 @@ class PDFSummarizer:
             embedding_provider (str): The provider to use for the embedding model (openai or huggingface).
             embedding_model_name (str): The name of the embedding model to use.
             embedding_api_key (Optional[str]): The API key to use for the embedding model.
+            pdf_workers (int): The number of processes extracting PDF pages in parallel.
+            retrieval_mode (str): How follow-up questions retrieve chunks ("vector", "hybrid" or "lexical").
         """
         self.llm_provider = llm_provider
         self.llm_name = llm_name
@@ -52,6 +54,7 @@ class PDFSummarizer:
             embedding_api_key=self.embedding_api_key,
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
+            pdf_workers=pdf_workers,
         )
 
         self.client = LLMClient(
@@ -59,24 +62,25 @@ class PDFSummarizer:
             model_name=self.llm_name,
             api_key=self.llm_api_key,
             store=self.store,
+            retrieval_mode=retrieval_mode,
         )
+        self.active_sources = []
 
-    def process_pdf_document(self, file: str) -> List[Document]:
+    def process_pdf_document(self, file: BinaryIO) -> List[Document]:
         """
-        Process a PDF document from a file path.
+        Process an uploaded PDF document.
 
         Args:
-            file_path (str): The path to the PDF document to process.
+            file (BinaryIO): The uploaded PDF document to process.
         """
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_pdf:
-            temp_pdf.write(file.getvalue())
-            documents = self.store.load_document(source=temp_pdf.name, source_type="pdf")
-            os.unlink(temp_pdf.name)
-
-        try:
-            processed_documents = self.store.add_to_store(documents)
-        except Exception:
-            processed_documents = self.store.create_store(documents)
+        # Parse the upload straight from memory; chunks are keyed on a hash of its content
+        documents = self.store.load_document(source=file, source_type="pdf")
+
+        # The store is opened on first use, so a failure here is a real one
+        processed_documents = self.store.add_to_store(documents)
+
+        # Answer follow-up questions from this source only
+        self.active_sources = self.client.set_document_sources(processed_documents)
 
         return processed_documents
 
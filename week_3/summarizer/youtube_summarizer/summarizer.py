@@ -4,7 +4,7 @@ from langchain_core.documents import Document
 from langchain_core.prompts import PromptTemplate
 
 from core.llm import LLMClient
-from core.storage import VectorStore
+from core.storage import SUPPORTED_RETRIEVAL_MODES, VectorStore
 from utils.model_util import (
     SUPPORTED_EMBEDDING_PROVIDERS,
     SUPPORTED_LLM_PROVIDERS,
@@ -23,6 +23,7 @@ class YoutubeSummarizer:
         embedding_api_key: Optional[str]=None,
         chunk_size: int=1024,
         chunk_overlap: int=200,
+        retrieval_mode: str=SUPPORTED_RETRIEVAL_MODES[0],
     ):
         """
         Initialize the YoutubeSummarizer with choice of model.
@@ -34,6 +35,7 @@ class YoutubeSummarizer:
             embedding_provider (str): The provider to use for the embedding model (openai or huggingface).
             embedding_model_name (str): The name of the embedding model to use.
             embedding_api_key (Optional[str]): The API key to use for the embedding model.
+            retrieval_mode (str): How follow-up questions retrieve chunks ("vector", "hybrid" or "lexical").
         """
         self.llm_provider = llm_provider
         self.llm_name = llm_name
@@ -57,7 +59,9 @@ class YoutubeSummarizer:
             model_name=self.llm_name,
             api_key=self.llm_api_key,
             store=self.store,
+            retrieval_mode=retrieval_mode,
         )
+        self.active_sources = []
 
     def download_and_process_video(self, url: str) -> List[Document]:
         """
@@ -68,10 +72,11 @@ class YoutubeSummarizer:
         """
         documents = self.store.load_document(source=url, source_type="youtube")
 
-        try:
-            processed_documents = self.store.add_to_store(documents)
-        except Exception:
-            processed_documents = self.store.create_store(documents)
+        # The store is opened on first use, so a failure here is a real one
+        processed_documents = self.store.add_to_store(documents)
+
+        # Answer follow-up questions from this source only
+        self.active_sources = self.client.set_document_sources(processed_documents)
 
         return processed_documents
 
@@ -0,0 +1,51 @@
+from typing import List, Optional
+
+from langchain_community.document_loaders import YoutubeLoader
+from langchain_community.document_loaders.base import BaseLoader
+from langchain_core.documents import Document
+
+from core.document_cache import TRANSCRIPT_CACHE_PATH, DocumentCache, get_document_cache
+
+class TranscriptLoader(BaseLoader):
+    def __init__(self, url: str, cache: Optional[DocumentCache]=None, use_cache: bool=True):
+        """
+        Initialize the TranscriptLoader.
+
+        Transcripts are cached by video ID, so `youtu.be`, `watch?v=`, embed and
+        timestamped URLs of the same video share one entry. They do not expire.
+
+        Args:
+            url (str): The URL (or ID) of the YouTube video to load.
+            cache (Optional[DocumentCache]): The cache of loaded transcripts. Defaults to the shared transcript cache.
+            use_cache (bool): Whether to read and write the cache.
+        """
+        self.url = url
+        self.video_id = self.extract_video_id(url)
+        self.cache = (cache or get_document_cache(TRANSCRIPT_CACHE_PATH, ttl=None)) if use_cache else None
+
+    @staticmethod
+    def extract_video_id(url: str) -> str:
+        """Get the canonical video ID of a YouTube URL, or of a bare video ID"""
+        url = url.strip()
+        if "/" not in url and "." not in url:
+            return url
+        return YoutubeLoader.extract_video_id(url)
+
+    def load(self) -> List[Document]:
+        """
+        Load the transcript of the video into document objects.
+
+        Returns:
+            List[Document]: A list of Document objects representing the transcript.
+        """
+        if self.cache is not None:
+            _, documents = self.cache.get(self.video_id)
+            if documents is not None:
+                return documents
+
+        documents = YoutubeLoader(self.video_id).load()
+
+        if self.cache is not None and documents:
+            self.cache.put(self.video_id, documents=documents)
+
+        return documents
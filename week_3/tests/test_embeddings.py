@@ -0,0 +1,53 @@
+import numpy as np
+
+from config.settings import env_config
+from core.embeddings import EmbeddingClient, HuggingFaceModelCache, ParallelHuggingFaceEmbeddings
+
+class FakeSentenceTransformer:
+    def __init__(self):
+        self.started = 0
+        self.stopped = 0
+
+    def start_multi_process_pool(self, devices):
+        self.started += 1
+        return {"processes": devices}
+
+    def stop_multi_process_pool(self, pool):
+        self.stopped += 1
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        return np.zeros((len(texts), 4))
+
+    def encode_multi_process(self, texts, pool, batch_size=32):
+        return np.ones((len(texts), 4))
+
+class FakeModel:
+    def __init__(self):
+        self._client = FakeSentenceTransformer()
+        self.encode_kwargs = {}
+
+def test_pool_is_started_once_and_stopped_with_the_model(monkeypatch):
+    model = FakeModel()
+    cache = HuggingFaceModelCache(idle_timeout=0)
+    monkeypatch.setattr(HuggingFaceModelCache, "load", staticmethod(lambda model_name, backend: model))
+
+    embedder = ParallelHuggingFaceEmbeddings(
+        cache.acquire("fake", "torch"),
+        batch_size=2,
+        max_workers=2,
+        pool=lambda: cache.pool("fake", "torch", 2)
+    )
+    for _ in range(3):
+        assert embedder.embed_documents(["text"] * 8) == [[1.0] * 4] * 8
+    assert model._client.started == 1
+    assert model._client.stopped == 0
+
+    cache.release("fake", "torch")
+    assert model._client.stopped == 1
+
+def test_blank_api_key_falls_back_to_the_environment(monkeypatch):
+    monkeypatch.setattr(env_config, "openai_api_key", "sk-environment")
+
+    client = EmbeddingClient(api_key="", use_cache=False)
+
+    assert client.embedder.embedder.client._client.api_key == "sk-environment"
@@ -27,8 +27,20 @@ SUPPORTED_OPENAI_EMBEDDING_MODELS = [
         "text-embedding-ada-002",
 ]
 
+# Models that can shorten their embeddings, with their full output size
+OPENAI_EMBEDDING_MODELS_WITH_DIMENSIONS = {
+        "text-embedding-3-small": 1536,
+        "text-embedding-3-large": 3072,
+}
+
 SUPPORTED_HUGGINGFACE_EMBEDDING_MODELS = [
         "all-MiniLM-L6-v2",
         "nomic-ai/nomic-embed-text-v1",
         "google/embeddinggemma-300m",
 ]
+
+SUPPORTED_HUGGINGFACE_BACKENDS = [
+        "torch",
+        "torch-int8",
+        "onnx",
+]